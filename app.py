@@ -1,29 +1,38 @@
-import os
 import css
-import json
+import math
+import board as bd
 import time
 import solver
+import metrics as m
+import cache as rc
+import saves as sv
+import lexicon as lx
+import ui
 import utils as u
 import config as c
 import streamlit as st
 
+# progress bar percentages reached as the solve stages finish
+PROGRESS_LEXICON = 5
+PROGRESS_SEARCH_START = 15
+
+# opening moves shown for an empty board
+OPENING_MOVES = 5
+
 st.set_page_config(layout="wide")
 css.set_app_wide_styling()
 
 def save_game():
     save_name = st.session_state.get("saved_file_name", None)
     if save_name:
-        file_name = f"save_{st.session_state.get("saved_file_name", int(time.time()))}.json"
-        file_path = os.path.join(c.SAVES_DIR, file_name)
-
-        # Create directory if it doesn't exist
-        os.makedirs(c.SAVES_DIR, exist_ok=True)
-
-        with open(file_path, "w") as f:
-            json.dump(u.get_grid(), f, indent=4)
-        
+        sv.get_save_store().save(save_name, ui.get_grid())
         st.session_state["saved_file_name"] = None
 
+def clear_results():
+    # forgets the last solve, so no later run shows or searches it further
+    for key in ("solver", "solve_key", "results_shown", "solved_grid", "results"):
+        st.session_state.pop(key, None)
+
 @st.dialog("💾 Save Game", on_dismiss=save_game)
 def save_file_dialog():
     file_name = st.text_input("What should the save be called?")
@@ -38,34 +47,33 @@ with board:
 
         if st.button("🔄 Reset Board"):
             st.session_state["load_game"] = None 
-            u.set_grid(reset=True)
+            ui.set_grid(reset=True)
+            clear_results()
         
-        # load
-        saved_games = []
-        if os.path.exists(c.SAVES_DIR):
-            saved_games = sorted(
-                os.listdir(c.SAVES_DIR),
-                key=lambda f: os.path.getctime(os.path.join(c.SAVES_DIR, f)),
-                reverse=True  # most recent first
-            )
-
-        saved_games = sorted(saved_games, reverse=True)
-        loaded_game = st.selectbox(
+        # load, one page of saves at a time, most recent first
+        save_store = sv.get_save_store()
+        save_pages = max(math.ceil(len(save_store) / c.SAVES_PAGE_SIZE), 1)
+        save_page = st.number_input("Page", min_value=1, max_value=save_pages, key="saves_page") if save_pages > 1 else 1
+        saved_games = [save["name"] for save in save_store.list(save_page - 1)]
+
+        def load_game():
+            # only when another save is picked, so edits made after loading are kept
+            if st.session_state["load_game"]:
+                grid = save_store.load(st.session_state["load_game"])
+                if grid is None:
+                    st.error(f"Unable to load game.")
+                else:
+                    ui.set_grid(grid)
+                    clear_results()
+
+        st.selectbox(
             label="📂 Load Game", 
             options=saved_games, 
             key="load_game",
             placeholder="Pick a saved game" if saved_games else "No saved games found",
-            index=None
+            index=None,
+            on_change=load_game
         )
-        if loaded_game:
-            try:
-                with open(os.path.join(f"{c.SAVES_DIR}", loaded_game), "r") as f:
-                    grid_str = f.read()
-                    grid = json.loads(grid_str)
-                    u.set_grid(grid)
-
-            except Exception as e:
-                st.error(f"Unable to load game.")
 
         # save
         if st.button("💾 Save Game"):
@@ -73,23 +81,19 @@ with board:
 
     st.markdown("")
 
-    with st.form(key="scrabble_board", clear_on_submit=False, enter_to_submit=False, border=False, width="content"):
-        with st.container(gap=None):
-            for i in range(c.MAX_GRID):
-                with st.container(horizontal=True, gap=None):  # one row
-                    for j in range(c.MAX_GRID):
-                        tile_key = c.tile_key(i, j)
-                        st.text_input(
-                            key=tile_key,
-                            label=tile_key,
-                            label_visibility="collapsed",
-                            max_chars=1
-                        )
+    # the whole board is one component with one value, see ui.board_editor
+    ui.board_editor()
 
+    with st.form(key="scrabble_board", clear_on_submit=False, enter_to_submit=False, border=False, width="content"):
         with st.container():
+            # only offered once there is more than one word list, see config.LEXICONS_DIR
+            lexicons = list(lx.get_lexicon_files())
+            lexicon_name = st.selectbox("Dictionary", lexicons, key="lexicon", width=c.MAX_GRID*c.PIXEL_COUNT_PER_TILE) if len(lexicons) > 1 else c.DEFAULT_LEXICON
+
             shelf = st.text_input(
                 key=c.SCRABBLE_SHELF_NAME,
                 label="What letters are on your shelf?",
+                help=f"Use {c.BLANK} for a blank tile. Letters played from a blank are shown in uppercase.",
                 max_chars=7,
                 width=c.MAX_GRID*c.PIXEL_COUNT_PER_TILE,
                 placeholder="· · · · · · ·"
@@ -101,38 +105,121 @@ with results:
     st.header("Playable Words")
     st.markdown("") # for spacing
 
+    # only submitting the form or "Show more" searches further, for at most
+    # c.SOLVE_TIME_BUDGET seconds; any other rerun (board edits, saves, "Stop")
+    # shows the plays found so far without searching
+    search_more = st.session_state.pop("search_more", False)
+    if form_submitted or search_more:
+        deadline = time.perf_counter() + c.SOLVE_TIME_BUDGET if c.SOLVE_TIME_BUDGET else None
+    else:
+        deadline = time.perf_counter()
+
+    # the plays shown are for the board as it was solved
+    if st.session_state.get("solver") is not None and ui.get_grid() != st.session_state.get("solved_grid"):
+        clear_results()
+
     if form_submitted:
         if len(shelf) == 0:
             st.error("Please enter letters on your shelf.")
             st.stop()
             
-        progress_text = "Solving..."
-        progress_bar = st.progress(0, text=progress_text)
-
-        grid = u.get_grid()            
-        progress_bar.progress(10, text=progress_text)
-
-        anchors = u.get_anchors(grid)
-        progress_bar.progress(25, text=progress_text)
-
-        s = solver.Solver(shelf, anchors)
-        progress_bar.progress(75, text=progress_text)
-
-        if not any(grid) and shelf:
-            st.info("Starting a new game? Here are some high scoring words to start with!")
-            for r in sorted(s.get_all_playable_words(), key=lambda x: u.score_value(x), reverse=True)[:5]:
-                st.write(f"- {r} ({u.score_value(r)} points)")
-        else:
-            res = s.get_ranked_results()
-            progress_bar.progress(100, text=progress_text)
-
-            if res:
-                st.success(f"Found {len(res)} playable words!")
-                for r in res:
-                    st.write(r)
+        grid = u.Grid.from_grid(ui.get_grid())
+
+        # an empty board has no anchors: the first move is looked up in the
+        # lexicon's opening table rather than searched
+        if grid.is_empty:
+            clear_results()
+            openings = lx.get_lexicon(lexicon_name).openings(shelf, OPENING_MOVES)
+            if openings:
+                st.info("Starting a new game? Here are the best opening moves!")
+                st.markdown("\n".join(solver.format_results(openings)))
             else:
                 st.info("I found no valid moves!")
-
-        progress_bar.empty()
-    else:
-        st.info("Fill out your board and shelf to see possible plays.")
\ No newline at end of file
+        else:
+            # the same board and shelf may have been solved before, by this or another session
+            solve_key = rc.fingerprint(grid, shelf, lexicon_name)
+            s = rc.get_result_cache().get(solve_key)
+            cached = s is not None
+
+            if not cached:
+                progress_text = "Solving..."
+                progress_bar = st.progress(0, text=progress_text)
+
+                # the bar follows the solve's stages: loading the lexicon, finding the
+                # anchors, then one step per anchor searched
+                metrics = m.SolveMetrics(profile=c.PROFILE_SOLVES)
+                def show_progress(stage, done, total):
+                    progress_bar.progress(PROGRESS_SEARCH_START + (100 - PROGRESS_SEARCH_START) * done // max(total, 1), text=f"{progress_text} ({stage})")
+
+                with metrics.stage("lexicon load"):
+                    dawg = lx.get_lexicon(lexicon_name).dawg
+                progress_bar.progress(PROGRESS_LEXICON, text=f"{progress_text} (anchors)")
+
+                # the board models persist across reruns so only changed lines are
+                # rescanned; one per lexicon, since cross checks depend on the words
+                with metrics.stage("anchors"):
+                    boards = st.session_state.setdefault("boards", {})
+                    if lexicon_name not in boards:
+                        boards[lexicon_name] = bd.Board(dawg)
+                    boards[lexicon_name].update(grid)
+                    anchors = boards[lexicon_name].anchors
+                progress_bar.progress(PROGRESS_SEARCH_START, text=f"{progress_text} (search)")
+
+                s = solver.Solver(shelf, anchors, metrics=metrics, lexicon=lexicon_name)
+
+            # only the first page is searched for now, "Show more" asks for the next
+            st.session_state["solver"] = s
+            st.session_state["solve_key"] = solve_key
+            st.session_state["solved_grid"] = ui.get_grid()
+            st.session_state["results_shown"] = c.RESULTS_PAGE_SIZE
+            st.session_state.pop("results", None)
+
+            if not cached:
+                # show the best plays found so far while the search goes on;
+                # clicking stop reruns the script, which interrupts the search
+                # and, being neither a submit nor "Show more", searches no further.
+                # The bar is only handed to this search, so neither a later
+                # run nor another session sharing the cached solver can reach it
+                stop_button = st.empty()
+                stop_button.button("⏹ Stop")
+                partial_results = st.empty()
+                for top in s.iter_top_results(c.RESULTS_PAGE_SIZE, deadline, progress=show_progress):
+                    partial_results.markdown("\n".join(solver.format_results(top)))
+                partial_results.empty()
+                stop_button.empty()
+
+                metrics.log_if_slow()
+                progress_bar.empty()
+    elif st.session_state.get("solver") is None:
+        st.info("Fill out your board and shelf to see possible plays.")
+
+    if st.session_state.get("solver") is not None:
+        # plain reruns (board edits, saves) show the page found last without
+        # asking the solver again; partial is this run's own, another session
+        # searching the same cached solver gets its own answer
+        if form_submitted or search_more or "results" not in st.session_state:
+            st.session_state["results"] = st.session_state["solver"].get_top_results(st.session_state["results_shown"], deadline)
+
+            # (re)cache the solver now that it has searched what this page needed
+            rc.get_result_cache().put(st.session_state["solve_key"], st.session_state["solver"], st.session_state["solver"].get_size())
+
+        plays, partial = st.session_state["results"]
+        res = solver.format_results(plays)
+
+        if partial:
+            st.warning("The search was stopped before it finished, these are the best plays found so far. \"Show more\" keeps searching.")
+
+        if res:
+            st.success(f"Showing the top {len(res)} plays!")
+            # one element for the whole page rather than one per result
+            st.markdown("\n".join(res))
+        elif not partial:
+            st.info("I found no valid moves!")
+
+        # a stopped search resumes where it stopped
+        if len(res) == st.session_state["results_shown"] or partial:
+            def show_more():
+                st.session_state["results_shown"] += c.RESULTS_PAGE_SIZE
+                st.session_state["search_more"] = True
+
+            st.button("Show more", on_click=show_more)
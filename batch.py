@@ -0,0 +1,124 @@
+import sys
+import json
+import time
+import argparse
+import collections
+import utils as u
+import solver
+import metrics as m
+import lexicon as lx
+import config as c
+
+# positions submitted ahead of the one being written, per worker; bounds how
+# much of the input (and how many results) is held in memory at once
+IN_FLIGHT_PER_WORKER = 4
+
+def solve_position(line, line_number, top, lexicon_name=c.DEFAULT_LEXICON, time_budget=None):
+    """
+    Solves one JSONL position, {"grid": [[...]], "rack": str} with an optional
+    "id" and "lexicon" (defaulting to lexicon_name), the grid in the format
+    ui.get_grid returns and app.py saves.
+
+    Returns (dict):
+        {"id", "moves": [{"word", "score", "row", "col", "direction"}], "seconds", "partial"}
+        with the top best moves, best first, or {"id", "error"} if the
+        position cannot be solved; id defaults to the line number. partial
+        is true if the search ran out of its time_budget (seconds) first,
+        the moves being the best found by then
+    """
+
+    deadline = time.perf_counter() + time_budget if time_budget else None
+
+    try:
+        position = json.loads(line)
+    except json.JSONDecodeError as e:
+        return {"id": line_number, "error": f"invalid JSON: {e}"}
+
+    if not isinstance(position, dict):
+        return {"id": line_number, "error": "expected a JSON object"}
+
+    position_id = position.get("id", line_number)
+    grid, rack = position.get("grid"), position.get("rack")
+    lexicon_name = position.get("lexicon", lexicon_name)
+    if not isinstance(rack, str) or not isinstance(grid, list) or len(grid) != c.MAX_GRID or any(not isinstance(row, list) or len(row) != c.MAX_GRID for row in grid):
+        return {"id": position_id, "error": f"expected a {c.MAX_GRID}x{c.MAX_GRID} grid and a rack"}
+    if not isinstance(lexicon_name, str):
+        return {"id": position_id, "error": "expected the lexicon as a name"}
+
+    # each lexicon is loaded once per process (and once per pool worker), not once per position
+    try:
+        lexicon = lx.get_lexicon(lexicon_name)
+    except ValueError as e:
+        return {"id": position_id, "error": str(e)}
+
+    metrics = m.SolveMetrics()
+    try:
+        grid = u.Grid.from_grid(grid)
+
+        # the first move of a game is a lookup in the lexicon's opening table
+        if grid.is_empty:
+            with metrics.stage("openings"):
+                plays, partial = lexicon.openings(rack.lower(), top), False
+        else:
+            with metrics.stage("anchors"):
+                anchors = u.get_anchors(grid, lexicon.dawg)
+
+            # already inside a worker, so the solve itself is serial
+            s = solver.Solver(rack, anchors, workers=0, metrics=metrics, lexicon=lexicon_name)
+            plays, partial = s.get_top_results(top, deadline)
+
+        moves = [
+            {"word": word, "score": score, "row": row, "col": col, "direction": direction}
+            for word, score, (row, col, direction) in plays
+        ]
+    except Exception as e:
+        # one malformed position (eg. a non-string square) must not end a long batch
+        return {"id": position_id, "error": f"unable to solve: {e!r}"}
+
+    return {"id": position_id, "moves": moves, "seconds": metrics.total, "partial": partial}
+
+def solve_positions(lines, top=c.RESULTS_PAGE_SIZE, workers=c.SOLVER_WORKERS, lexicon_name=c.DEFAULT_LEXICON, time_budget=None):
+    """
+    Solves a stream of JSONL positions (see solve_position), yielding results
+    in input order as soon as they are ready. Lines are read lazily, so a
+    stream of any length is solved in bounded memory; with workers > 1 the
+    positions are spread over the solver's process pool.
+    """
+
+    numbered = ((n, line) for n, line in enumerate(lines, start=1) if line.strip())
+    if workers <= 1:
+        for n, line in numbered:
+            yield solve_position(line, n, top, lexicon_name, time_budget)
+        return
+
+    pool = solver._get_pool(workers)
+    pending = collections.deque()
+    for n, line in numbered:
+        pending.append(pool.submit(solve_position, line, n, top, lexicon_name, time_budget))
+        if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+            yield pending.popleft().result()
+
+    while pending:
+        yield pending.popleft().result()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve positions from a JSONL file, writing the ranked moves of each as JSONL.")
+    parser.add_argument("input", nargs="?", default="-", help='JSONL file of {"grid", "rack", "id"} positions, - for stdin')
+    parser.add_argument("-o", "--output", default="-", help="JSONL file to write the results to, - for stdout")
+    parser.add_argument("--top", type=int, default=c.RESULTS_PAGE_SIZE, help="moves to keep per position")
+    parser.add_argument("--workers", type=int, default=c.SOLVER_WORKERS, help="worker processes, 0 or 1 to solve serially")
+    parser.add_argument("--time-budget", type=float, default=None, help="seconds to search each position for before keeping the best moves found")
+    parser.add_argument("--lexicon", default=c.DEFAULT_LEXICON, choices=list(lx.get_lexicon_files()), help="lexicon of positions without their own")
+    args = parser.parse_args()
+
+    src = sys.stdin if args.input == "-" else open(args.input, "r")
+    dst = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        for res in solve_positions(src, args.top, args.workers, args.lexicon, args.time_budget):
+            dst.write(json.dumps(res) + "\n")
+            dst.flush()
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
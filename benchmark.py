@@ -0,0 +1,255 @@
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import tracemalloc
+import numpy as np
+import utils as u
+import solver
+import lexicon as lx
+import config as c
+
+# the boards are saved games (same JSON grid as app.py writes to c.SAVES_DIR),
+# racks.json pairs every board with the racks to solve it for
+BOARDS_DIR = os.path.join(c.BENCHMARKS_DIR, "boards")
+RACKS_FILE = os.path.join(c.BENCHMARKS_DIR, "racks.json")
+BASELINE_FILE = os.path.join(c.BENCHMARKS_DIR, "baseline.json")
+
+# "top k" is the bounded search and ranking of one page of results the app
+# and batch.py run, from a fresh solver; "openings" is the lookup they run
+# instead on an empty board, only timed for those
+STAGES = ("anchors", "rack filter", "anchored search", "ranking", "top k", "openings")
+
+# the engine modules workers and batch jobs import; they must not pull in Streamlit
+ENGINE_MODULES = ("solver", "batch")
+
+# a stage regresses if it is this much slower (or hungrier) than the baseline,
+# and by more than the absolute floor so timer noise on tiny stages is ignored
+REGRESSION_THRESHOLD = 0.25
+MIN_TIME_DELTA = 0.002 # seconds
+MIN_MEMORY_DELTA = 64 * 1024 # bytes
+
+def load_cases():
+    """returns [(case name, grid, rack)] for every board of the corpus and each of its racks"""
+
+    with open(RACKS_FILE, "r") as f:
+        racks = json.load(f)
+
+    cases = []
+    for board, board_racks in racks.items():
+        with open(os.path.join(BOARDS_DIR, f"{board}.json"), "r") as f:
+            grid = json.load(f)
+
+        cases += [(f"{board}/{rack}", grid, rack) for rack in board_racks]
+
+    return cases
+
+def run_stages(lexicon, grid, rack):
+    """
+    Solves one case stage by stage: the full search and ranking of every
+    play, then the top k path app.py and batch.py take, or the opening
+    lookup for an empty board.
+
+    Returns (dict):
+        {stage: seconds} for every stage of STAGES that applies to the case
+    """
+
+    times = {}
+
+    start = time.perf_counter()
+    anchors = u.get_anchors(grid, lexicon.dawg)
+    times["anchors"] = time.perf_counter() - start
+
+    # serial, so the numbers do not depend on the machine's core count
+    s = solver.Solver(rack, anchors, workers=0)
+
+    start = time.perf_counter()
+    s.get_all_playable_words()
+    times["rack filter"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    s.get_anchored_playable_words()
+    times["anchored search"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    s.get_ranked_results()
+    times["ranking"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    solver.Solver(rack, anchors, workers=0).get_top_results(c.RESULTS_PAGE_SIZE)
+    times["top k"] = time.perf_counter() - start
+
+    if u.Grid.from_grid(grid).is_empty:
+        start = time.perf_counter()
+        lexicon.openings(rack, c.RESULTS_PAGE_SIZE)
+        times["openings"] = time.perf_counter() - start
+
+    return times
+
+def measure_memory(lexicon, grid, rack):
+    """returns {stage: peak bytes allocated while the stage ran}, in a separate pass since tracing slows every allocation down"""
+
+    peaks = {}
+    tracemalloc.start()
+    try:
+        def traced(stage, fn):
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            res = fn()
+            peaks[stage] = tracemalloc.get_traced_memory()[1] - base
+            return res
+
+        anchors = traced("anchors", lambda: u.get_anchors(grid, lexicon.dawg))
+        s = solver.Solver(rack, anchors, workers=0)
+        traced("rack filter", s.get_all_playable_words)
+        traced("anchored search", s.get_anchored_playable_words)
+        traced("ranking", s.get_ranked_results)
+        traced("top k", lambda: solver.Solver(rack, anchors, workers=0).get_top_results(c.RESULTS_PAGE_SIZE))
+        if u.Grid.from_grid(grid).is_empty:
+            traced("openings", lambda: lexicon.openings(rack, c.RESULTS_PAGE_SIZE))
+    finally:
+        tracemalloc.stop()
+
+    return peaks
+
+def measure_import(repeat=5):
+    """
+    Imports the engine in fresh interpreters.
+
+    Returns (dict):
+        {"seconds": median import time, "modules": modules loaded, "streamlit": whether Streamlit was imported}
+    """
+
+    code = (
+        "import sys, time, json; start = time.perf_counter(); import " + ", ".join(ENGINE_MODULES) + "; "
+        "print(json.dumps({'seconds': time.perf_counter() - start, 'modules': len(sys.modules), 'streamlit': 'streamlit' in sys.modules}))"
+    )
+    runs = [
+        json.loads(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout)
+        for _ in range(repeat)
+    ]
+    return {**runs[-1], "seconds": float(np.median([r["seconds"] for r in runs]))}
+
+def run(repeat):
+    """
+    Runs every case repeat times.
+
+    Returns (dict):
+        {"cases": {case: {stage: {"p50", "p95", "peak"}}}, "stages": {stage: {"p50", "p95"}},
+        "throughput": solves per second, "lexicon_load": seconds, "import": see measure_import}
+    """
+
+    engine_import = measure_import()
+
+    start = time.perf_counter()
+    lexicon = lx.get_lexicon()
+    lexicon.dawg
+    lexicon_load = time.perf_counter() - start
+
+    cases = load_cases()
+    samples = {name: {} for name, _, _ in cases}
+
+    # warm up once so lazily built structures are not billed to the first case
+    for _, grid, rack in cases:
+        run_stages(lexicon, grid, rack)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for name, grid, rack in cases:
+            for stage, seconds in run_stages(lexicon, grid, rack).items():
+                samples[name].setdefault(stage, []).append(seconds)
+    elapsed = time.perf_counter() - start
+
+    res = {"cases": {}, "stages": {}, "throughput": len(cases) * repeat / elapsed, "lexicon_load": lexicon_load, "import": engine_import}
+    for name, grid, rack in cases:
+        peaks = measure_memory(lexicon, grid, rack)
+        res["cases"][name] = {
+            stage: {
+                "p50": float(np.percentile(samples[name][stage], 50)),
+                "p95": float(np.percentile(samples[name][stage], 95)),
+                "peak": peaks[stage],
+            }
+            for stage in STAGES if stage in samples[name]
+        }
+
+    for stage in STAGES:
+        stage_samples = [t for name in samples for t in samples[name].get(stage, [])]
+        if not stage_samples:
+            continue
+
+        res["stages"][stage] = {
+            "p50": float(np.percentile(stage_samples, 50)),
+            "p95": float(np.percentile(stage_samples, 95)),
+        }
+
+    return res
+
+def find_regressions(res, baseline, threshold=REGRESSION_THRESHOLD):
+    """returns a message for every case stage of res that is slower or takes more memory than in baseline"""
+
+    regressions = []
+    if res["import"]["streamlit"]:
+        regressions.append(f"importing {', '.join(ENGINE_MODULES)} imports streamlit")
+
+    previous = baseline.get("import")
+    if previous and res["import"]["seconds"] > previous["seconds"] * (1 + threshold) and res["import"]["seconds"] - previous["seconds"] > MIN_TIME_DELTA:
+        regressions.append(f"engine import: {previous['seconds'] * 1000:.0f} -> {res['import']['seconds'] * 1000:.0f} ms")
+
+    for name, stages in res["cases"].items():
+        for stage, current in stages.items():
+            previous = baseline.get("cases", {}).get(name, {}).get(stage)
+            if previous is None:
+                continue
+
+            if current["p50"] > previous["p50"] * (1 + threshold) and current["p50"] - previous["p50"] > MIN_TIME_DELTA:
+                regressions.append(f"{name} {stage}: p50 {previous['p50'] * 1000:.2f} -> {current['p50'] * 1000:.2f} ms")
+
+            if current["peak"] > previous["peak"] * (1 + threshold) and current["peak"] - previous["peak"] > MIN_MEMORY_DELTA:
+                regressions.append(f"{name} {stage}: peak {previous['peak'] / 1024:.0f} -> {current['peak'] / 1024:.0f} KiB")
+
+    return regressions
+
+def report(res):
+    print(f"{'case':<24}{'stage':<18}{'p50 ms':>10}{'p95 ms':>10}{'peak KiB':>11}")
+    for name, stages in res["cases"].items():
+        for stage, stats in stages.items():
+            print(f"{name:<24}{stage:<18}{stats['p50'] * 1000:>10.2f}{stats['p95'] * 1000:>10.2f}{stats['peak'] / 1024:>11.0f}")
+
+    print()
+    for stage, stats in res["stages"].items():
+        print(f"{'all cases':<24}{stage:<18}{stats['p50'] * 1000:>10.2f}{stats['p95'] * 1000:>10.2f}")
+
+    print()
+    print(f"engine import: {res['import']['seconds'] * 1000:.0f} ms, {res['import']['modules']} modules{', with streamlit' if res['import']['streamlit'] else ''}")
+    print(f"lexicon load: {res['lexicon_load']:.2f} s")
+    print(f"throughput: {res['throughput']:.1f} solves/s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the solver over the board corpus in benchmarks/.")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs of every case")
+    parser.add_argument("--save-baseline", action="store_true", help=f"store the result as the new baseline in {BASELINE_FILE}")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD, help="relative slowdown flagged as a regression")
+    args = parser.parse_args()
+
+    res = run(args.repeat)
+    report(res)
+
+    if args.save_baseline:
+        with open(BASELINE_FILE, "w") as f:
+            json.dump(res, f, indent=4)
+        print(f"saved baseline to {BASELINE_FILE}")
+    elif os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE, "r") as f:
+            regressions = find_regressions(res, json.load(f), args.threshold)
+
+        print()
+        if regressions:
+            print(f"{len(regressions)} regressions against {BASELINE_FILE}:")
+            print("\n".join(regressions))
+            sys.exit(1)
+
+        print(f"no regressions against {BASELINE_FILE}")
+    else:
+        print("no baseline yet, run with --save-baseline to store one")
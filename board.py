@@ -0,0 +1,102 @@
+import utils as u
+import config as c
+
+
+class Board:
+    """
+    Stateful board that keeps the anchors and cross checks of every row and
+    column between solves.
+
+    update() diffs a new grid against the last one and only rebuilds the lines
+    whose anchors can have changed, so a turn that adds a few tiles to one row
+    or column does not rescan the whole board.
+
+    Args:
+        dawg (dawg.Dawg | None): word graph to compute cross checks with,
+            anchors carry no cross checks if None (like utils.get_anchors).
+        grid (list[list[str]] | None): initial board, empty if None.
+    """
+
+    def __init__(self, dawg=None, grid=None):
+        self.dawg = dawg
+        self.grid = u.Grid()
+
+        # cross_checks[direction][i][j] is the (mask, score) cross check of
+        # square (i, j) for words played in direction, see utils.get_cross_checks
+        empty = [(c.ALL_LETTERS, None)] * c.MAX_GRID
+        self.cross_checks = {
+            c.HORIZONTAL_ANCHOR_DIR: [list(empty) for _ in range(c.MAX_GRID)],
+            c.VERTICAL_ANCHOR_DIR: [list(empty) for _ in range(c.MAX_GRID)],
+        }
+
+        self.row_anchors = [[] for _ in range(c.MAX_GRID)]
+        self.col_anchors = [[] for _ in range(c.MAX_GRID)]
+        self._anchors = []
+
+        if grid is not None:
+            self.update(grid)
+
+    @property
+    def anchors(self):
+        """anchors of the whole board, in the same order as utils.get_anchors"""
+        return self._anchors
+
+    def update(self, grid):
+        """
+        Bring the board in line with grid, recomputing only what the changed squares affect.
+
+        Args:
+            grid (utils.Grid | list[list[str]]): the new board, as returned by ui.get_grid.
+
+        Returns (set[tuple[int, int]]):
+            the (row, col) squares that changed, 0-based
+        """
+
+        grid = u.Grid.from_grid(grid)
+        changed = self.grid.diff(grid)
+        if not changed:
+            return changed
+
+        self.grid = grid
+
+        # a changed square always changes its own row and column
+        dirty_rows = {i for i, _ in changed}
+        dirty_cols = {j for _, j in changed}
+
+        if self.dawg is not None:
+            horizontal = self.cross_checks[c.HORIZONTAL_ANCHOR_DIR]
+            vertical = self.cross_checks[c.VERTICAL_ANCHOR_DIR]
+
+            # horizontal plays are checked against columns; a changed column
+            # dirties every row whose square in that column got a new check
+            for j in {j for _, j in changed}:
+                checks = u.get_line_cross_checks(grid.col(j), self.dawg)
+                for i, check in enumerate(checks):
+                    if horizontal[i][j] != check:
+                        horizontal[i][j] = check
+                        dirty_rows.add(i)
+
+            # and vertical plays against rows
+            for i in {i for i, _ in changed}:
+                checks = u.get_line_cross_checks(grid.row(i), self.dawg)
+                for j, check in enumerate(checks):
+                    if vertical[i][j] != check:
+                        vertical[i][j] = check
+                        dirty_cols.add(j)
+
+        for i in dirty_rows:
+            self.row_anchors[i] = u.generate_anchors_from_slice(grid.row(i), ("row", i), self._line_checks(c.HORIZONTAL_ANCHOR_DIR, "row", i), grid.row_bits[i])
+
+        for j in dirty_cols:
+            self.col_anchors[j] = u.generate_anchors_from_slice(grid.col(j), ("col", j), self._line_checks(c.VERTICAL_ANCHOR_DIR, "col", j), grid.col_bits[j])
+
+        self._anchors = [a for line in self.row_anchors + self.col_anchors for a in line]
+        return changed
+
+    def _line_checks(self, direction, arr_type, index):
+        # cross checks along a row or column, None without a word graph
+        if self.dawg is None:
+            return None
+
+        checks = self.cross_checks[direction]
+        return checks[index] if arr_type == "row" else [row[index] for row in checks]
@@ -0,0 +1,95 @@
+import hashlib
+import threading
+import collections
+import utils as u
+import config as c
+
+_result_cache = None
+_result_cache_lock = threading.Lock()
+
+def fingerprint(grid, shelf, lexicon=c.DEFAULT_LEXICON):
+    """
+    Key of a solve: a hash of the lexicon name, the board (a utils.Grid or
+    as returned by ui.get_grid) and the sorted shelf, so the same position with the shelf
+    typed in another order (or another case) gets the same key, while the
+    same position solved against another lexicon does not.
+    """
+
+    board = u.Grid.from_grid(grid).squares
+    rack = "".join(sorted(shelf.lower()))
+    return hashlib.blake2b(f"{lexicon}|{board}|{rack}".encode(), digest_size=16).hexdigest()
+
+class ResultCache:
+    """
+    Least recently used cache of solved positions, capped by an estimate of
+    the memory its entries hold rather than by their number.
+
+    Args:
+        max_bytes (int): entries are evicted, least recently used first, once
+            their sizes add up to more than this.
+    """
+
+    def __init__(self, max_bytes=c.RESULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict() # key -> (value, size)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        """returns the value cached for key and marks it as recently used, None on a miss"""
+
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def put(self, key, value, size):
+        """
+        Caches value under key, replacing what was there; putting a value
+        again updates its size, eg. once more of it has been computed.
+        A value larger than the whole cache is not kept.
+        """
+
+        with self._lock:
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[1]
+
+            if size > self.max_bytes:
+                return
+
+            self._entries[key] = (value, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size -= evicted
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self):
+        """returns {"hits", "misses", "entries", "bytes", "max_bytes"}"""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "bytes": self.size, "max_bytes": self.max_bytes}
+
+def get_result_cache():
+    """returns the process wide result cache, shared by every session"""
+
+    global _result_cache
+    with _result_cache_lock:
+        if _result_cache is None:
+            _result_cache = ResultCache()
+
+        return _result_cache
@@ -1,4 +1,40 @@
+import os
+
 WORDS_FILE = "words.txt"
+LEXICON_FILE = "words.lex" # compiled by running lexicon.py, see Lexicon.save
+
+# WORDS_FILE is served as the DEFAULT_LEXICON, and every word list
+# LEXICONS_DIR/<name>.txt (eg. twl.txt, sowpods.txt) as lexicon <name>,
+# compiled next to it as <name>.lex
+DEFAULT_LEXICON = "default"
+LEXICONS_DIR = "lexicons"
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+LETTER_INDEX = {letter: i for i, letter in enumerate(ALPHABET)}
+ALL_LETTERS = (1 << len(ALPHABET)) - 1 # letter mask with every letter allowed
+BLANK = "?" # blank tile on the shelf; letters played from it are shown in uppercase and score 0
+
+# anchored windows with at least this many placed letters are matched with the
+# lexicon's positional index, sparser windows by walking the word graph
+POSITIONAL_INDEX_MIN_PLACED = 2
+
+# worker processes for the anchored search, 0 or 1 to solve serially; boards
+# with fewer anchors than PARALLEL_MIN_ANCHORS are never worth the round trip
+SOLVER_WORKERS = int(os.environ.get("WORD_BANDIT_SOLVER_WORKERS", 0))
+PARALLEL_MIN_ANCHORS = 16
+
+# solves slower than this are logged with their stage breakdown (see
+# metrics.SolveMetrics), and with a cProfile capture if PROFILE_SOLVES is set
+SLOW_SOLVE_SECONDS = float(os.environ.get("WORD_BANDIT_SLOW_SOLVE_SECONDS", 2.0))
+PROFILE_SOLVES = os.environ.get("WORD_BANDIT_PROFILE_SOLVES", "") == "1"
+
+# the app stops searching after this many seconds and shows the best plays
+# found so far, flagged as partial (see Solver.iter_top_results); 0 to always
+# search until done
+SOLVE_TIME_BUDGET = float(os.environ.get("WORD_BANDIT_SOLVE_TIME_BUDGET", 5.0))
+
+# solved positions are cached for every session of the process, up to this
+# many bytes of matched plays (see cache.ResultCache)
+RESULT_CACHE_BYTES = int(os.environ.get("WORD_BANDIT_RESULT_CACHE_MB", 256)) * 2**20
 POINTS = {'a': 1, 'b': 3, 'c': 3, 'd': 2, 'e': 1, 'f': 4, 'g': 2, 'h': 4, 'i': 1, 'j': 8, 'k': 5, 'l': 1, 'm': 3, 'n': 1, 'o': 1, 'p': 3, 'q': 10, 'r': 1, 's': 1, 't': 1, 'u': 1, 'v': 4, 'w': 4, 'x': 8, 'y': 4, 'z': 10}
 
 SCORE_MULTIPLIERS = {
@@ -32,6 +68,9 @@ SCORE_MULTIPLIERS = {
     (15, 4): "DL", (15, 12): "DL",
 }
 
+BINGO_TILES = 7 # playing this many tiles in one move earns BINGO_BONUS
+BINGO_BONUS = 50
+
 MULTIPLIER_COLORS = {
     "TW": "#ff4d4d",
     "DW": "#ffb366",
@@ -41,12 +80,14 @@ MULTIPLIER_COLORS = {
 }
 
 MAX_GRID = 15
+EMPTY_SQUARE = "." # empty square of a board encoded as a string, see utils.encode_grid
 PIXEL_COUNT_PER_TILE = 40
 HORIZONTAL_ANCHOR_DIR = "played horizontally"
 VERTICAL_ANCHOR_DIR = "played vertically"
 
 SCRABBLE_SHELF_NAME = "scrabble_shelf"
+RESULTS_PAGE_SIZE = 25 # plays shown per page of results
 SAVES_DIR = "saves"
-
-def tile_key(row, col):
-    return f"R{row}C{col}"
\ No newline at end of file
+SAVES_DB = os.path.join(SAVES_DIR, "saves.db") # see saves.SaveStore
+SAVES_PAGE_SIZE = 50 # saved games listed per page of the load menu
+BENCHMARKS_DIR = "benchmarks" # board corpus, racks and baseline of benchmark.py
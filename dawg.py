@@ -0,0 +1,234 @@
+from array import array
+import numpy as np
+import utils as u
+import config as c
+
+NO_NODE = 0 # the root is never a child, so 0 marks a missing edge
+
+class _Node:
+    __slots__ = ("edges", "final")
+
+    def __init__(self):
+        self.edges = {}
+        self.final = False
+
+    def key(self):
+        # two nodes are interchangeable if they accept the same suffixes
+        return (self.final, tuple((letter, id(child)) for letter, child in sorted(self.edges.items())))
+
+class Dawg:
+    """
+    Directed acyclic word graph (minimized trie) over a word list.
+
+    Built with the incremental algorithm for sorted input (Daciuk et al.), then
+    flattened into a dense transition table so a lookup is one array index:
+        child = table[26 * node + letter_index], NO_NODE if there is no edge.
+    Node 0 is the root.
+
+    suffix_lengths[node] buckets the words below every node by length: bit k
+    is set if some path of k letters leads from node to the end of a word,
+    so a walk can stop as soon as no word below it fits the squares left.
+    """
+
+    def __init__(self, words):
+        root = self._build(sorted(words))
+
+        # number the nodes breadth first, root first
+        ids = {id(root): 0}
+        nodes = [root]
+        for node in nodes:
+            for child in node.edges.values():
+                if id(child) not in ids:
+                    ids[id(child)] = len(nodes)
+                    nodes.append(child)
+
+        self.table = array("i", bytes(4 * 26 * len(nodes)))
+        self.terminal = bytearray(len(nodes))
+        for i, node in enumerate(nodes):
+            self.terminal[i] = node.final
+            for letter, child in node.edges.items():
+                self.table[26*i + c.LETTER_INDEX[letter]] = ids[id(child)]
+
+        self.suffix_lengths = get_suffix_lengths(self.table, self.terminal)
+
+    @classmethod
+    def from_tables(cls, table, terminal, suffix_lengths=None):
+        """wraps an already flattened transition table and terminal flags, eg. mapped from a compiled lexicon"""
+        graph = cls.__new__(cls)
+        graph.table = table
+        graph.terminal = terminal
+        graph.suffix_lengths = get_suffix_lengths(table, terminal) if suffix_lengths is None else suffix_lengths
+        return graph
+
+    def __len__(self):
+        return len(self.terminal)
+
+    def __contains__(self, word):
+        node = self.walk(word)
+        return node != NO_NODE and bool(self.terminal[node])
+
+    @staticmethod
+    def _build(words):
+        root = _Node()
+        register = {}
+        unchecked = [] # (parent, letter, child) along the path of the previous word
+        previous = ""
+
+        def minimize(down_to):
+            while len(unchecked) > down_to:
+                parent, letter, child = unchecked.pop()
+                key = child.key()
+                if key in register:
+                    parent.edges[letter] = register[key]
+                else:
+                    register[key] = child
+
+        for word in words:
+            common = 0
+            while common < min(len(word), len(previous)) and word[common] == previous[common]:
+                common += 1
+
+            minimize(common)
+            node = unchecked[-1][2] if unchecked else root
+            for letter in word[common:]:
+                child = _Node()
+                node.edges[letter] = child
+                unchecked.append((node, letter, child))
+                node = child
+
+            node.final = True
+            previous = word
+
+        minimize(0)
+        return root
+
+    def walk(self, letters, node=0):
+        """returns the node reached by following letters from node, NO_NODE if there is no such path"""
+        for letter in letters:
+            i = c.LETTER_INDEX.get(letter)
+            if i is None:
+                return NO_NODE
+
+            node = self.table[26*node + i]
+            if node == NO_NODE:
+                return NO_NODE
+
+        return node
+
+    def match_window(self, pattern, first_start, last_start, first_end, last_end, shelf):
+        """
+        Find every word that can be laid into a window of squares.
+
+        Args:
+            pattern (list[str | int]): one entry per square of the window, the
+                placed letter, or for an empty square the mask of letters that
+                may be played on it (bit k for c.ALPHABET[k]).
+            first_start, last_start (int): range of window indices the first
+                letter of the word may occupy (inclusive).
+            first_end, last_end (int): range of window indices the last letter
+                of the word may occupy (inclusive).
+            shelf (str): letters available to fill empty squares. A blank
+                (c.BLANK) fills a square with any allowed letter, but only once
+                the shelf has run out of that letter.
+
+        Returns (set[tuple[str, int]]):
+            (word, start) for every word that fits the placed letters, covers
+            every placed letter in the window, and uses at least one letter
+            from the shelf, with start the window index of its first letter.
+            Letters played from a blank are in uppercase.
+        """
+
+        fixed = [i for i, square in enumerate(pattern) if isinstance(square, str)]
+        if fixed:
+            last_start = min(last_start, fixed[0])
+            first_end = max(first_end, fixed[-1])
+
+        last_end = min(last_end, len(pattern) - 1)
+        available = bytearray(u.letter_counts(shelf))
+        blanks = shelf.count(c.BLANK)
+        table, terminal, suffix_lengths = self.table, self.terminal, self.suffix_lengths
+        suffix_masks = _get_suffix_masks(pattern, first_end, last_end, len(shelf))
+        found = set()
+
+        def extend(node, i, word, used):
+            # word occupies the window up to (not including) index i
+            nonlocal blanks
+            if used and i - 1 >= first_end and terminal[node]:
+                found.add((word, i - len(word)))
+
+            # no word below node ends on a square the window and the shelf reach
+            if i > last_end or not suffix_lengths[node] & suffix_masks[i][len(shelf) - used]:
+                return
+
+            square = pattern[i]
+            if isinstance(square, str):
+                child = self.walk(square, node)
+                if child != NO_NODE:
+                    extend(child, i + 1, word + square, used)
+                return
+
+            base = 26 * node
+            for li in range(26):
+                if not square >> li & 1:
+                    continue
+
+                child = table[base + li]
+                if child == NO_NODE:
+                    continue
+
+                if available[li]:
+                    available[li] -= 1
+                    extend(child, i + 1, word + c.ALPHABET[li], used + 1)
+                    available[li] += 1
+                elif blanks:
+                    blanks -= 1
+                    extend(child, i + 1, word + c.ALPHABET[li].upper(), used + 1)
+                    blanks += 1
+
+        for start in range(max(first_start, 0), last_start + 1):
+            extend(0, start, "", 0)
+
+        return found
+
+def get_suffix_lengths(table, terminal):
+    """
+    Returns (array):
+        unsigned 64 bit mask per node of a flattened word graph, bit k set if a path
+        of k letters leads from the node to a terminal node (see Dawg)
+    """
+
+    children = np.frombuffer(table, dtype=np.int32).reshape(-1, 26)
+    edges = children != NO_NODE
+    final = np.frombuffer(terminal, dtype=np.uint8).astype(np.uint64)
+
+    # a node's lengths are its children's plus one, the graph being acyclic
+    # this settles after as many rounds as the longest word has letters
+    masks = final.copy()
+    while True:
+        shifted = np.where(edges, masks[children] << np.uint64(1), np.uint64(0))
+        updated = final | np.bitwise_or.reduce(shifted, axis=1)
+        if np.array_equal(updated, masks):
+            return array("Q", masks.tobytes())
+
+        masks = updated
+
+def _get_suffix_masks(pattern, first_end, last_end, tiles):
+    # masks[i][t]: bit k set if a word whose first i - start squares are laid
+    # may still take k more letters, ending on the window no earlier than
+    # first_end, with t tiles left for the empty squares on the way
+    masks = []
+    for i in range(len(pattern) + 1):
+        by_tiles = [0] * (tiles + 1)
+        empty = 0
+        for end in range(i, last_end + 1):
+            empty += not isinstance(pattern[end], str)
+            if empty > tiles:
+                break
+            if end >= first_end:
+                by_tiles[empty] |= 1 << (end - i + 1)
+
+        for t in range(1, tiles + 1):
+            by_tiles[t] |= by_tiles[t - 1]
+        masks.append(by_tiles)
+
+    return masks
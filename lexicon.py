@@ -0,0 +1,649 @@
+import os
+import sys
+import glob
+import math
+import mmap
+import struct
+import tempfile
+import functools
+import threading
+import numpy as np
+import dawg
+import opening as op
+import utils as u
+import config as c
+
+# shelves with more distinct sub-shelves than this are answered with a full
+# is_playable scan instead of the anagram index
+MAX_SUBSHELVES = 4096
+
+# rack x word cells is_playable checks in one broadcast, bounding its memory
+IS_PLAYABLE_CHUNK_CELLS = 2**24
+
+# compiled lexicon file layout: header, then one 8 byte aligned block per section
+MAGIC = b"WBLX"
+FORMAT_VERSION = 6
+HEADER = struct.Struct("<4sII") # magic, format version, section count
+SECTION = struct.Struct("<QQ") # offset, size in bytes
+SECTIONS = (
+    ("word_offsets", np.uint32),
+    ("word_data", np.uint8),
+    ("lengths", np.uint8),
+    ("letter_counts", np.uint8),
+    ("scores", np.uint16),
+    ("anagram_weights", np.uint64),
+    ("anagram_hashes", np.uint64),
+    ("anagram_words", np.int32),
+    ("opening_keys", np.uint64),
+    ("opening_words", np.int32),
+    ("opening_scores", np.uint16),
+    ("opening_starts", np.uint8),
+    ("opening_vertical", np.uint8),
+    ("bucket_words", np.int32),
+    ("bucket_starts", np.int64),
+    ("bucket_letter_counts", np.uint8),
+    ("positional_keys", np.int64),
+    ("positional_starts", np.int64),
+    ("positional_words", np.int32),
+    ("dawg_table", np.int32),
+    ("dawg_terminal", np.uint8),
+    ("dawg_lengths", np.uint64),
+)
+
+# per letter weights hashing a word's letter counts to its anagram key
+ANAGRAM_WEIGHTS = np.random.default_rng(20251018).integers(1, 2**63, size=26, dtype=np.uint64)
+
+def _fits(counts, available, blanks):
+    # rows of counts that available covers, with blanks making up any shortage
+    if not blanks:
+        return (counts <= available).all(axis=1)
+
+    shortage = (counts - np.minimum(counts, available)).sum(axis=1, dtype=np.uint16)
+    return shortage <= blanks
+
+def _fits_racks(counts, available, blanks):
+    # (racks x words) mask of the words each rack of available covers, with
+    # its blanks making up any shortage; counts is letter-major (26 x words).
+    # A rack covers a word if it matches all but blanks of its letters, and
+    # only the racks holding a letter do any work for it
+    matched = np.zeros((len(available), counts.shape[1]), dtype=np.uint8)
+    for letter in np.flatnonzero(available.any(axis=0)).tolist():
+        racks = np.flatnonzero(available[:, letter])
+        matched[racks] += np.minimum(counts[letter], available[racks, letter, None])
+
+    return counts.sum(axis=0, dtype=np.uint8) - matched <= blanks[:, None]
+
+class PackedWords:
+    """
+    Read-only sequence of words stored back to back in one buffer, so a
+    mapped lexicon file can serve words without a str object per word.
+
+    Args:
+        data (bytes | mmap.mmap): buffer holding the ascii bytes of every word, concatenated.
+        offsets (memoryview): uint32 offsets, word i is data[start+offsets[i]:start+offsets[i+1]].
+        start (int): where the words begin in data.
+    """
+
+    def __init__(self, data, offsets, start=0):
+        self.data = data
+        self.offsets = offsets
+        self.start = start
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("word index out of range")
+
+        return self.data[self.start + self.offsets[i]:self.start + self.offsets[i + 1]].decode("ascii")
+
+    def __iter__(self):
+        return iter(self.take(range(len(self))))
+
+    def take(self, ids):
+        """returns the words at ids (ints), without per word bounds checks"""
+        data, offsets, start = self.data, self.offsets, self.start
+        return [data[start + offsets[i]:start + offsets[i + 1]].decode("ascii") for i in ids]
+
+class Lexicon:
+    """
+    Read-only word list plus the structures derived from it at load time.
+
+    One instance is shared by every Solver (and every Streamlit session) in the
+    process via get_lexicon(), so nothing on it may be mutated after __init__.
+    Every structure is a flat array (see SECTIONS), so a lexicon can be saved
+    once with save() and memory mapped by any number of processes with load().
+
+    Attributes:
+        words (PackedWords): the word list, in file order.
+        lengths (np.ndarray): uint8 array, lengths[i] is len(words[i]).
+        letter_counts (np.ndarray): N x 26 uint8 matrix, row i holds the a-z
+            letter counts of words[i].
+        scores (np.ndarray): base score (sum of letter points) of every word.
+        anagram_hashes, anagram_words (np.ndarray): word ids sorted by a hash
+            of their letter counts, so anagrams sit next to each other.
+        opening_keys (np.ndarray): sorted anagram hashes of the words a full
+            shelf can open a game with, so anagrams sit next to each other;
+            opening_words, opening_scores, opening_starts and
+            opening_vertical hold each word and its best opening (see
+            opening.get_best_openings).
+        bucket_words (np.ndarray): word ids ordered by length, so every run
+            of lengths is one slice starting at bucket_starts[length];
+            bucket_letter_counts holds their letter counts in that order,
+            letter-major (26 x N), so is_playable reads one contiguous row
+            per letter.
+        positional_index (dict[tuple[int, int, str], np.ndarray]): maps
+            (word length, position in word, letter) to the ascending ids of
+            the words of that length with that letter at that position.
+    """
+
+    def __init__(self, words):
+        words = list(words)
+        data = "".join(words).encode("ascii")
+        lengths = np.fromiter((len(word) for word in words), dtype=np.uint8)
+        offsets = np.zeros(len(lengths) + 1, dtype=np.uint32)
+        np.cumsum(lengths, out=offsets[1:])
+
+        # count every letter of every word in one pass over the joined word list
+        letters = np.frombuffer(data, dtype=np.uint8) - ord("a")
+        owners = np.repeat(np.arange(len(lengths)), lengths)
+        valid = letters < 26 # non a-z characters are ignored, as in utils.letter_counts
+        letter_counts = np.bincount(
+            owners[valid] * 26 + letters[valid], minlength=26 * len(lengths)
+        ).astype(np.uint8)
+
+        points = np.array([c.POINTS[letter] for letter in c.ALPHABET], dtype=np.uint16)
+        scores = letter_counts.reshape(-1, 26) @ points
+
+        # anagrams have the same letter counts and so the same hash
+        hashes = letter_counts.reshape(-1, 26).astype(np.uint64) @ ANAGRAM_WEIGHTS
+        anagram_words = np.argsort(hashes, kind="stable").astype(np.int32)
+
+        # opening table: the best opening of every word, ordered by anagram
+        # key, then score (best first), then word id
+        opening_ids = np.flatnonzero((lengths >= 2) & (lengths <= c.BINGO_TILES))
+        opening_scores, opening_starts, opening_vertical = op.get_best_openings([words[i] for i in opening_ids.tolist()])
+        opening_order = np.lexsort((opening_ids, -opening_scores, hashes[opening_ids]))
+
+        # bucket the words by length; a stable sort keeps word ids ascending
+        # inside each bucket
+        bucket_words = np.argsort(lengths, kind="stable").astype(np.int32)
+        bucket_starts = np.searchsorted(lengths[bucket_words], np.arange(int(lengths.max(initial=0)) + 2))
+
+        # group every (word, position, letter) by (length, position, letter);
+        # a stable sort keeps word ids ascending inside each group
+        positions = np.arange(len(letters)) - offsets[owners]
+        keys = (lengths[owners].astype(np.int64) * 256 + positions) * 26 + letters
+        order = np.argsort(keys[valid], kind="stable")
+        grouped_keys = keys[valid][order]
+        starts = np.r_[0, np.flatnonzero(np.diff(grouped_keys)) + 1, len(grouped_keys)] if len(grouped_keys) else np.zeros(1, dtype=np.int64)
+
+        self._set_sections(data, 0, {
+            "word_offsets": offsets,
+            "word_data": np.frombuffer(data, dtype=np.uint8),
+            "lengths": lengths,
+            "letter_counts": letter_counts,
+            "scores": scores,
+            "anagram_weights": ANAGRAM_WEIGHTS,
+            "anagram_hashes": hashes[anagram_words],
+            "anagram_words": anagram_words,
+            "opening_keys": hashes[opening_ids][opening_order],
+            "opening_words": opening_ids[opening_order].astype(np.int32),
+            "opening_scores": opening_scores[opening_order],
+            "opening_starts": opening_starts[opening_order],
+            "opening_vertical": opening_vertical[opening_order],
+            "bucket_words": bucket_words,
+            "bucket_starts": bucket_starts.astype(np.int64),
+            "bucket_letter_counts": np.ascontiguousarray(letter_counts.reshape(-1, 26)[bucket_words].T),
+            "positional_keys": grouped_keys[starts[:-1]],
+            "positional_starts": starts.astype(np.int64),
+            "positional_words": owners[valid][order].astype(np.int32),
+        })
+
+    def _set_sections(self, buffer, word_data_offset, sections):
+        # derive the public attributes from the flat section arrays; words are
+        # sliced straight out of buffer, which holds word_data at word_data_offset
+        self._sections = sections
+        self.words = PackedWords(buffer, memoryview(sections["word_offsets"]), word_data_offset)
+        self.lengths = sections["lengths"]
+        self.letter_counts = sections["letter_counts"].reshape(-1, 26)
+        self.scores = sections["scores"]
+        self.anagram_hashes = sections["anagram_hashes"]
+        self.anagram_words = sections["anagram_words"]
+        self.opening_keys = sections["opening_keys"]
+        self.opening_words = sections["opening_words"]
+        self.opening_scores = sections["opening_scores"]
+        self.opening_starts = sections["opening_starts"]
+        self.opening_vertical = sections["opening_vertical"]
+        self.bucket_words = sections["bucket_words"]
+        self.bucket_starts = sections["bucket_starts"]
+        self.bucket_letter_counts = sections["bucket_letter_counts"].reshape(26, -1)
+
+        keys, starts, grouped = sections["positional_keys"], sections["positional_starts"], sections["positional_words"]
+        self.positional_index = {
+            (key // 26 // 256, key // 26 % 256, c.ALPHABET[key % 26]): grouped[start:end]
+            for key, start, end in zip(keys.tolist(), starts[:-1].tolist(), starts[1:].tolist())
+        }
+
+        self._dawg = None
+        self._dawg_lock = threading.Lock()
+        if "dawg_table" in sections:
+            self._dawg = dawg.Dawg.from_tables(memoryview(sections["dawg_table"]), memoryview(sections["dawg_terminal"]), memoryview(sections["dawg_lengths"]))
+
+    def save(self, path):
+        """
+        Compile the lexicon, word graph included, into a single file for load().
+        The file is written next to path and then renamed over it, so
+        processes that have the old file mapped keep reading the old pages.
+
+        Args:
+            path (str): where to write the compiled lexicon.
+        """
+
+        sections = dict(self._sections)
+        sections["dawg_table"] = np.frombuffer(self.dawg.table, dtype=np.int32)
+        sections["dawg_terminal"] = np.frombuffer(self.dawg.terminal, dtype=np.uint8)
+        sections["dawg_lengths"] = np.frombuffer(self.dawg.suffix_lengths, dtype=np.uint64)
+
+        blocks = [np.ascontiguousarray(sections[name], dtype=dtype).tobytes() for name, dtype in SECTIONS]
+
+        offset = HEADER.size + SECTION.size * len(SECTIONS)
+        layout = []
+        for block in blocks:
+            offset += -offset % 8
+            layout.append((offset, len(block)))
+            offset += len(block)
+
+        # truncating a mapped file in place would kill its readers with SIGBUS
+        fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=os.path.dirname(os.path.abspath(path)))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(SECTIONS)))
+                for section in layout:
+                    f.write(SECTION.pack(*section))
+
+                for (start, _), block in zip(layout, blocks):
+                    f.write(b"\0" * (start - f.tell()))
+                    f.write(block)
+
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """
+        Memory map a lexicon compiled by save(). Nothing is parsed or copied,
+        so loading takes near constant time and every process mapping the same
+        file shares its pages.
+
+        Args:
+            path (str): compiled lexicon file.
+
+        Returns (Lexicon):
+            the mapped lexicon
+
+        Raises:
+            ValueError: if path is not a compiled lexicon of the current
+                format, or is empty, truncated or otherwise damaged.
+        """
+
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, version, count = HEADER.unpack_from(buffer, 0)
+            if magic != MAGIC or version != FORMAT_VERSION or count != len(SECTIONS):
+                raise ValueError(f"{path} is not a version {FORMAT_VERSION} compiled lexicon")
+
+            layout = [SECTION.unpack_from(buffer, HEADER.size + SECTION.size * k) for k in range(len(SECTIONS))]
+            for (name, dtype), (offset, size) in zip(SECTIONS, layout):
+                if offset + size > len(buffer) or size % np.dtype(dtype).itemsize:
+                    raise ValueError(f"{path} is truncated: section {name} does not fit")
+        except struct.error as e:
+            buffer.close()
+            raise ValueError(f"{path} is truncated: {e}") from e
+        except ValueError:
+            buffer.close()
+            raise
+
+        sections, offsets = {}, {}
+        for (name, dtype), (offset, size) in zip(SECTIONS, layout):
+            sections[name] = np.frombuffer(buffer, dtype=dtype, count=size // np.dtype(dtype).itemsize, offset=offset)
+            offsets[name] = offset
+
+        if len(sections["word_offsets"]) != len(sections["lengths"]) + 1 or sections["word_offsets"][-1] != len(sections["word_data"]):
+            raise ValueError(f"{path} is damaged: its words do not match their offsets")
+
+        lexicon = cls.__new__(cls)
+        lexicon._set_sections(buffer, offsets["word_data"], sections)
+        return lexicon
+
+    def __len__(self):
+        return len(self.words)
+
+    @property
+    def dawg(self):
+        """word graph used by the anchored search, built on first use"""
+        if self._dawg is None:
+            with self._dawg_lock:
+                if self._dawg is None:
+                    self._dawg = dawg.Dawg(self.words)
+
+        return self._dawg
+
+    def _bucket_start(self, length):
+        # offset in bucket_words of the words of length letters, lengths past the longest word clamp to the end
+        return int(self.bucket_starts[min(max(length, 0), len(self.bucket_starts) - 1)])
+
+    def is_playable(self, letters, anchor_letters=""):
+        """
+        Vectorized utils.is_playable against every word in the lexicon at once.
+        Blanks on a shelf act as a budget for the letters it is short of. A
+        batch of shelves is checked in one broadcast over (shelves x words),
+        a chunk of shelves at a time (see IS_PLAYABLE_CHUNK_CELLS).
+
+        Args:
+            letters (str | list[str]): a shelf, or a list of shelves to check in one batch.
+            anchor_letters (str): letters already on the board that every shelf may also use.
+
+        Returns (np.ndarray):
+            boolean mask over self.words, of shape (N,) for a single shelf or
+            (len(letters), N) for a batch.
+        """
+
+        batch = not isinstance(letters, str)
+        shelves = letters if batch else [letters]
+
+        available = np.array(
+            [np.frombuffer(u.letter_counts(shelf + anchor_letters), dtype=np.uint8) for shelf in shelves],
+            dtype=np.uint8,
+        ).reshape(len(shelves), 26)
+        blanks = np.array([min(shelf.count(c.BLANK), 255) for shelf in shelves], dtype=np.uint8)
+        sizes = np.array([len(shelf) + len(anchor_letters) for shelf in shelves], dtype=np.int64)
+
+        # a word is playable if it needs no more of any letter than we have,
+        # so only the length buckets up to the longest shelf are checked
+        end = self._bucket_start(int(sizes.max(initial=0)) + 1)
+        ids, counts = self.bucket_words[:end], self.bucket_letter_counts[:, :end]
+        lengths = self.lengths[ids]
+
+        # every shelf of a chunk is checked against every word at once; few
+        # words fit a shelf, so only those are scattered back to word order
+        mask = np.zeros((len(shelves), len(self.words)), dtype=bool)
+        step = max(IS_PLAYABLE_CHUNK_CELLS // max(end, 1), 1)
+        for lo in range(0, len(shelves), step):
+            fits = _fits_racks(counts, available[lo:lo + step], blanks[lo:lo + step])
+            rows, cols = np.nonzero(fits & (lengths <= sizes[lo:lo + step, None]))
+            mask[lo + rows, ids[cols]] = True
+
+        return mask if batch else mask[0]
+
+    def playable_words(self, letters):
+        """
+        Args:
+            letters (str): letters available to build words from, eg. the shelf.
+
+        Returns (list[str]):
+            every word in the lexicon that can be built from letters, in lexicon order
+        """
+
+        return self.words.take(np.flatnonzero(self.is_playable(letters)).tolist())
+
+    def match_window(self, pattern, first_start, last_start, first_end, last_end, shelf):
+        """
+        Same contract as dawg.Dawg.match_window, answered from the positional
+        index: for every word span the window allows, the candidates are the
+        intersection of the (length, position, letter) groups of its placed
+        letters, filtered by one vectorized shelf check. The more letters are
+        already placed, the smaller the intersection.
+        """
+
+        fixed = [i for i, square in enumerate(pattern) if isinstance(square, str)]
+        if not fixed:
+            return set()
+
+        # every placed letter in the window must be part of the word
+        last_start = min(last_start, fixed[0])
+        first_end = max(first_end, fixed[-1])
+        last_end = min(last_end, len(pattern) - 1)
+
+        placed = "".join(pattern[i] for i in fixed)
+        available = np.frombuffer(u.letter_counts(shelf + placed), dtype=np.uint8)
+        blanks = shelf.count(c.BLANK)
+        max_length = len(fixed) + len(shelf)
+
+        found = set()
+        for start in range(max(first_start, 0), last_start + 1):
+            for end in range(first_end, last_end + 1):
+                length = end - start + 1
+                if length > max_length:
+                    break
+
+                # the word has to place at least one tile from the shelf
+                if length == len(fixed):
+                    continue
+
+                groups = [self.positional_index.get((length, i - start, pattern[i])) for i in fixed]
+                if any(group is None for group in groups):
+                    continue
+
+                groups.sort(key=len)
+                candidates = groups[0]
+                for group in groups[1:]:
+                    candidates = np.intersect1d(candidates, group, assume_unique=True)
+                    if not len(candidates):
+                        break
+
+                if len(candidates):
+                    playable = _fits(self.letter_counts[candidates], available, blanks)
+
+                    # empty squares that only accept some letters (cross checks)
+                    constrained = [
+                        (i - start, pattern[i]) for i in range(start, end + 1)
+                        if not isinstance(pattern[i], str) and pattern[i] != c.ALL_LETTERS
+                    ]
+                    for word in self.words.take(candidates[playable].tolist()):
+                        if all(mask >> c.LETTER_INDEX[word[k]] & 1 for k, mask in constrained):
+                            found.add((self._assign_blanks(word, pattern, start, shelf) if blanks else word, start))
+
+        return found
+
+    @staticmethod
+    def _assign_blanks(word, pattern, start, shelf):
+        # same left to right blank assignment as the word graph walk, placed
+        # letters are left alone
+        available = {k: shelf.count(k) for k in shelf}
+        res = ""
+        for k, letter in enumerate(word):
+            if isinstance(pattern[start + k], str):
+                res += letter
+            elif available.get(letter, 0):
+                available[letter] -= 1
+                res += letter
+            else:
+                res += letter.upper()
+
+        return res
+
+    def anagrams(self, letters):
+        """
+        Every word that can be built from letters, found by looking up the
+        anagram hash of each distinct sub-shelf of letters (at most 127 for
+        7 tiles) in the sorted hashes instead of scanning the word list.
+
+        Args:
+            letters (str): letters available to build words from, eg. the
+                shelf, in any case.
+
+        Shelves with blanks skip the index and use the is_playable shortage
+        budget, so a blank costs one scan rather than 26 lookups per sub-shelf.
+
+        Returns (list[tuple[str, int]]):
+            (word, base score) pairs, highest score first, ties alphabetical;
+            letters played from a blank are in uppercase and score nothing
+        """
+
+        letters = letters.lower()
+        counts = [(c.LETTER_INDEX[letter], letters.count(letter)) for letter in sorted(set(letters)) if letter in c.LETTER_INDEX]
+        if c.BLANK in letters:
+            words = [u.assign_blanks(word, letters) for word in self.playable_words(letters)]
+            res = [(word, u.score_value(word)) for word in words]
+        elif not counts:
+            res = []
+        elif math.prod(cnt + 1 for _, cnt in counts) > MAX_SUBSHELVES:
+            ids = np.flatnonzero(self.is_playable(letters))
+            res = list(zip(self.words.take(ids.tolist()), self.scores[ids].tolist()))
+        else:
+            hashes = self._get_subshelf_hashes(counts)
+
+            ids = np.concatenate([self.anagram_words[lo:hi] for lo, hi in zip(
+                np.searchsorted(self.anagram_hashes, hashes, side="left").tolist(),
+                np.searchsorted(self.anagram_hashes, hashes, side="right").tolist(),
+            ) if hi > lo] + [np.empty(0, dtype=np.int32)])
+
+            # a hash collision could only add words, which the exact check drops
+            available = np.frombuffer(u.letter_counts(letters), dtype=np.uint8)
+            ids = ids[_fits(self.letter_counts[ids], available, 0)]
+            res = list(zip(self.words.take(ids.tolist()), self.scores[ids].tolist()))
+
+        return sorted(res, key=lambda x: (-x[1], x[0].lower(), x[0]))
+
+    def openings(self, letters, k=None):
+        """
+        The best first moves of a game: words built from letters and placed
+        over the centre square of the empty board (see opening.py).
+
+        A shelf without blanks is answered from the opening table with one
+        lookup per distinct sub-shelf (at most 127 for 7 tiles) and nothing
+        left to score: each key found holds the best placement of every one
+        of its anagrams. Other shelves score the placements of every word
+        anagrams() finds.
+
+        Args:
+            letters (str): the shelf, in any case.
+            k (int | None): only return the k best moves.
+
+        Returns (list[tuple[str, int, tuple]]):
+            (word, score, position) best first, ties alphabetical, position
+            being where the word's first letter goes; one move per word,
+            whichever way the shelf was answered
+        """
+
+        letters = letters.lower()
+        counts = [(c.LETTER_INDEX[letter], letters.count(letter)) for letter in sorted(set(letters)) if letter in c.LETTER_INDEX]
+        # the table only holds words a full shelf can play
+        if c.BLANK in letters or len(letters) > c.BINGO_TILES or math.prod(cnt + 1 for _, cnt in counts) > MAX_SUBSHELVES:
+            # a blank can go on any square of the letter it stands for, every
+            # placement is scored and the best kept for each word
+            words = [placement for word, _ in self.anagrams(letters) for placement in u.get_blank_placements(word)]
+            scores, starts, vertical = op.get_best_openings(words)
+            rows = sorted(np.flatnonzero(scores >= 0).tolist(), key=lambda i: -int(scores[i]))
+            best = {}
+            for i in rows:
+                best.setdefault(words[i].lower(), i)
+            res = [(words[i], int(scores[i]), op.get_position(int(starts[i]), bool(vertical[i]))) for i in best.values()]
+        elif not counts or not len(self.opening_keys):
+            res = []
+        else:
+            hashes = self._get_subshelf_hashes(counts)
+            rows = np.concatenate([np.arange(lo, hi) for lo, hi in zip(
+                np.searchsorted(self.opening_keys, hashes, side="left").tolist(),
+                np.searchsorted(self.opening_keys, hashes, side="right").tolist(),
+            ) if hi > lo] + [np.empty(0, dtype=np.int64)])
+
+            # as in anagrams(), a hash collision is dropped by the exact check
+            available = np.frombuffer(u.letter_counts(letters), dtype=np.uint8)
+            rows = rows[_fits(self.letter_counts[self.opening_words[rows]], available, 0)].tolist()
+            res = [
+                (self.words[int(self.opening_words[i])], int(self.opening_scores[i]), op.get_position(int(self.opening_starts[i]), bool(self.opening_vertical[i])))
+                for i in rows
+            ]
+
+        res = sorted(res, key=lambda x: (-x[1], x[0].lower(), x[0]))
+        return res if k is None else res[:k]
+
+    def _get_subshelf_hashes(self, counts):
+        # anagram hashes of the letter counts of every distinct sub-shelf of
+        # counts, (letter index, count) pairs, hashed like the words
+        subshelves = np.zeros((math.prod(cnt + 1 for _, cnt in counts), 26), dtype=np.uint64)
+        subshelves[:, [li for li, _ in counts]] = np.indices([cnt + 1 for _, cnt in counts]).reshape(len(counts), -1).T
+        return subshelves @ self._sections["anagram_weights"]
+
+_lexicons = {} # name -> Lexicon, see get_lexicon
+_lexicons_lock = threading.Lock()
+
+@functools.cache
+def get_lexicon_files():
+    """
+    Returns (dict):
+        {name: (word list, compiled file)} of every lexicon that can be
+        served, c.DEFAULT_LEXICON first, then the word lists of
+        c.LEXICONS_DIR by name; looked up once per process
+    """
+
+    files = {c.DEFAULT_LEXICON: (c.WORDS_FILE, c.LEXICON_FILE)}
+    for path in sorted(glob.glob(os.path.join(c.LEXICONS_DIR, "*.txt"))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        files.setdefault(name, (path, os.path.splitext(path)[0] + ".lex"))
+
+    return files
+
+def get_lexicon(name=c.DEFAULT_LEXICON):
+    """
+    Returns the process-wide Lexicon called name (see get_lexicon_files),
+    loaded on first use only: mapped from its compiled file if it is up to
+    date, else parsed from its word list. A compiled lexicon is mapped read
+    only, so its pages are shared by every session and every process that
+    maps it; memory grows with the number of lexicons in use, not with the
+    number of solvers. Safe to call from concurrent Streamlit sessions.
+    """
+
+    lexicon = _lexicons.get(name)
+    if lexicon is None:
+        files = get_lexicon_files()
+        if name not in files:
+            raise ValueError(f"Unknown lexicon: {name}")
+
+        with _lexicons_lock:
+            if name not in _lexicons:
+                _lexicons[name] = _load_lexicon(*files[name])
+            lexicon = _lexicons[name]
+
+    return lexicon
+
+def _load_lexicon(words_file, lexicon_file):
+    # prefer the compiled lexicon unless the word list was edited after it was built
+    if os.path.exists(lexicon_file) and os.path.getmtime(lexicon_file) >= os.path.getmtime(words_file):
+        try:
+            return Lexicon.load(lexicon_file)
+        except ValueError:
+            pass
+
+    # a missing, stale or damaged compiled file is rebuilt for the processes
+    # that start next; where it cannot be written the word list is parsed each time
+    lexicon = Lexicon(u.load_words(words_file))
+    try:
+        lexicon.save(lexicon_file)
+    except OSError:
+        pass
+
+    return lexicon
+
+if __name__ == "__main__":
+    # build step: python lexicon.py [name ...] compiles the word list of every
+    # (or every named) lexicon into its compiled file
+    for name, (words_file, lexicon_file) in get_lexicon_files().items():
+        if len(sys.argv) > 1 and name not in sys.argv[1:]:
+            continue
+
+        Lexicon(u.load_words(words_file)).save(lexicon_file)
+        print(f"compiled {words_file} into {lexicon_file} ({os.path.getsize(lexicon_file)} bytes)")
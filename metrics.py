@@ -0,0 +1,102 @@
+import io
+import json
+import time
+import pstats
+import cProfile
+import logging
+import contextlib
+import config as c
+
+logger = logging.getLogger(__name__)
+
+class SolveMetrics:
+    """
+    Structured timings of one solve, filled in by Solver and the code around it:
+        - stages: seconds spent per named stage (lexicon load, anchors, search,
+          scoring, sorting), accumulated if a stage runs more than once
+        - anchors: one record per searched anchor, with its search time and
+          the number of plays it matched
+        - counters: free form counts, eg. plays scored
+
+    Args:
+        profile (bool): also capture a cProfile of every stage, see profile_stats.
+    """
+
+    def __init__(self, profile=False):
+        self.stages = {}
+        self.anchors = []
+        self.counters = {}
+        self._profiler = cProfile.Profile() if profile else None
+        self._depth = 0 # stages can nest, the profiler runs for the outermost one
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """times the block as stage name"""
+
+        if self._profiler is not None and self._depth == 0:
+            self._profiler.enable()
+
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0) + time.perf_counter() - start
+            self._depth -= 1
+            if self._profiler is not None and self._depth == 0:
+                self._profiler.disable()
+
+    def add_time(self, name, seconds):
+        """adds seconds spent outside a stage block to stage name, eg. waiting on worker processes"""
+        self.stages[name] = self.stages.get(name, 0) + seconds
+
+    def add_anchor(self, index, anchor_position, seconds, candidates):
+        self.anchors.append({"index": index, "anchor_position": anchor_position, "seconds": seconds, "candidates": candidates})
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    @property
+    def total(self):
+        """seconds spent in every stage"""
+        return sum(self.stages.values())
+
+    def profile_stats(self, limit=25):
+        """returns the cProfile capture as text, the limit slowest functions by cumulative time, None if not profiling"""
+
+        if self._profiler is None:
+            return None
+
+        out = io.StringIO()
+        pstats.Stats(self._profiler, stream=out).sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+    def report(self, slowest_anchors=10):
+        """
+        Returns (dict):
+            {"total", "stages", "counters", "anchors_searched", "candidates",
+            "slowest_anchors"} plus "profile" when profiling; only plain
+            types, so it serializes to JSON
+        """
+
+        res = {
+            "total": self.total,
+            "stages": dict(self.stages),
+            "counters": dict(self.counters),
+            "anchors_searched": len(self.anchors),
+            "candidates": sum(a["candidates"] for a in self.anchors),
+            "slowest_anchors": sorted(self.anchors, key=lambda a: -a["seconds"])[:slowest_anchors],
+        }
+        if self._profiler is not None:
+            res["profile"] = self.profile_stats()
+
+        return res
+
+    def log_if_slow(self, threshold=c.SLOW_SOLVE_SECONDS):
+        """logs a warning with the full report if the solve took longer than threshold seconds, returns whether it did"""
+
+        if self.total <= threshold:
+            return False
+
+        logger.warning("slow solve (%.2f s): %s", self.total, json.dumps(self.report(), default=str))
+        return True
@@ -0,0 +1,92 @@
+import numpy as np
+import scoring as sc
+import config as c
+
+# the first move of a game has to cover the centre square, (CENTER, CENTER)
+# 1-based; on an empty board it is the only square a word can be built through
+CENTER = (c.MAX_GRID + 1) // 2
+DIRECTIONS = (c.HORIZONTAL_ANCHOR_DIR, c.VERTICAL_ANCHOR_DIR)
+
+# premiums along the centre row and the centre column, in DIRECTIONS order
+_LINE_MULTIPLIERS = (
+    (sc.LETTER_MULTIPLIERS[CENTER - 1], sc.WORD_MULTIPLIERS[CENTER - 1]),
+    (sc.LETTER_MULTIPLIERS[:, CENTER - 1], sc.WORD_MULTIPLIERS[:, CENTER - 1]),
+)
+
+def get_starts(length):
+    """returns the 0-based squares of the centre line a word of length can start on and still cover the centre"""
+    return range(max(CENTER - length, 0), min(CENTER - 1, c.MAX_GRID - length) + 1)
+
+def get_position(start, vertical):
+    """returns the 1-based (row, col, direction) of a word starting on square start of the centre row, or column if vertical"""
+    return (start + 1, CENTER, c.VERTICAL_ANCHOR_DIR) if vertical else (CENTER, start + 1, c.HORIZONTAL_ANCHOR_DIR)
+
+def get_opening_placements(word):
+    """
+    Every placement of word on an empty board that covers the centre square,
+    in both directions, scored like scoring.score_plays. Letters in uppercase
+    were played from a blank and score 0.
+
+    Returns (list[tuple[int, tuple]]):
+        (score, position) per placement, position being the 1-based (row,
+        col, direction) of the word's first letter; horizontal placements
+        first, then top to bottom or left to right
+    """
+
+    if len(word) < 2:
+        return []
+
+    points = sc.LETTER_POINTS[np.frombuffer(word.encode("ascii", "replace"), dtype=np.uint8) & 127]
+    bingo = c.BINGO_BONUS if len(word) == c.BINGO_TILES else 0
+
+    res = []
+    for vertical, (letter_multipliers, word_multipliers) in enumerate(_LINE_MULTIPLIERS):
+        for start in get_starts(len(word)):
+            span = slice(start, start + len(word))
+            score = int(points @ letter_multipliers[span]) * int(word_multipliers[span].prod()) + bingo
+            res.append((score, get_position(start, vertical)))
+
+    return res
+
+def get_best_openings(words):
+    """
+    Best placement over the centre square of each of words (see
+    get_opening_placements), vectorized over the words of each length.
+
+    Args:
+        words (list[str]): lowercase words.
+
+    Returns (tuple[np.ndarray, np.ndarray, np.ndarray]):
+        per word its best score (-1 if it cannot open, eg. a single letter),
+        the 0-based start of that placement along the centre line and
+        whether the placement is vertical; ties go to horizontal
+        placements, then to the earliest start
+    """
+
+    scores = np.full(len(words), -1, dtype=np.int32)
+    starts = np.zeros(len(words), dtype=np.uint8)
+    vertical = np.zeros(len(words), dtype=np.uint8)
+
+    lengths = np.fromiter((len(word) for word in words), dtype=np.int32, count=len(words))
+    for length in np.unique(lengths).tolist():
+        ids = np.flatnonzero(lengths == length)
+        if length < 2 or length > c.MAX_GRID:
+            continue
+
+        codes = np.frombuffer("".join(words[i] for i in ids).encode("ascii", "replace"), dtype=np.uint8)
+        points = sc.LETTER_POINTS[codes & 127].reshape(len(ids), length)
+        bingo = c.BINGO_BONUS if length == c.BINGO_TILES else 0
+
+        # one column per (direction, start), in the order ties are broken in
+        options = [(d, start) for d in range(len(DIRECTIONS)) for start in get_starts(length)]
+        totals = np.stack([
+            points @ _LINE_MULTIPLIERS[d][0][start:start + length] * int(_LINE_MULTIPLIERS[d][1][start:start + length].prod()) + bingo
+            for d, start in options
+        ], axis=1)
+
+        best = totals.argmax(axis=1)
+        scores[ids] = totals[np.arange(len(ids)), best]
+        starts[ids] = [options[k][1] for k in best.tolist()]
+        vertical[ids] = [options[k][0] for k in best.tolist()]
+
+    return scores, starts, vertical
@@ -0,0 +1,117 @@
+import os
+import sys
+import glob
+import json
+import time
+import sqlite3
+import threading
+import utils as u
+import config as c
+
+_save_store = None
+_save_store_lock = threading.Lock()
+
+class SaveStore:
+    """
+    Saved games in a SQLite database: one row per save with its name,
+    creation time, tile count and encoded board (see utils.encode_grid), indexed by
+    creation time so listing a page and loading a save do not depend on how
+    many saves there are.
+
+    Args:
+        path (str): database file, created with its directory if missing.
+    """
+
+    def __init__(self, path=c.SAVES_DB):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        # one connection shared by every session's thread, serialized by the lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS saves (name TEXT PRIMARY KEY, created REAL NOT NULL, tiles INTEGER NOT NULL, board TEXT NOT NULL)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS saves_created ON saves (created DESC)")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM saves").fetchone()[0]
+
+    def save(self, name, grid, created=None, replace=True):
+        """stores grid as name, replacing an existing save of that name unless replace is False"""
+
+        board = u.encode_grid(grid)
+        tiles = sum(square != c.EMPTY_SQUARE for square in board)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR {'REPLACE' if replace else 'IGNORE'} INTO saves (name, created, tiles, board) VALUES (?, ?, ?, ?)",
+                (str(name), time.time() if created is None else created, tiles, board),
+            )
+
+    def load(self, name):
+        """returns the board saved as name, None if there is no such save"""
+
+        with self._lock:
+            row = self._conn.execute("SELECT board FROM saves WHERE name = ?", (name,)).fetchone()
+
+        return None if row is None else u.decode_grid(row[0])
+
+    def list(self, page=0, page_size=c.SAVES_PAGE_SIZE):
+        """
+        Returns (list[dict]):
+            {"name", "created", "tiles"} of the saves on page (0-based), most
+            recent first
+        """
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, created, tiles FROM saves ORDER BY created DESC, name LIMIT ? OFFSET ?",
+                (page_size, page * page_size),
+            ).fetchall()
+
+        return [{"name": name, "created": created, "tiles": tiles} for name, created, tiles in rows]
+
+    def import_json(self, path):
+        """
+        Imports a JSON save as written by earlier versions of app.py, named
+        after its file without the save_ prefix. A save of the same name
+        already in the store is kept.
+
+        Returns (bool):
+            True if the file held a board
+        """
+
+        try:
+            with open(path, "r") as f:
+                grid = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if not isinstance(grid, list) or len(grid) != c.MAX_GRID or any(
+            not isinstance(row, list) or len(row) != c.MAX_GRID or not all(isinstance(cell, str) for cell in row) for row in grid
+        ):
+            return False
+
+        name = os.path.splitext(os.path.basename(path))[0].removeprefix("save_")
+        self.save(name, grid, created=os.path.getmtime(path), replace=False)
+        return True
+
+    def import_json_dir(self, directory=c.SAVES_DIR):
+        """imports every JSON save in directory, returns how many were imported"""
+        return sum(self.import_json(path) for path in glob.glob(os.path.join(directory, "*.json")))
+
+def get_save_store():
+    """returns the process wide save store, importing any JSON saves in c.SAVES_DIR when it is first opened"""
+
+    global _save_store
+    with _save_store_lock:
+        if _save_store is None:
+            _save_store = SaveStore()
+            _save_store.import_json_dir()
+
+        return _save_store
+
+if __name__ == "__main__":
+    # python saves.py a.json b.json ... imports JSON saves by hand
+    store = get_save_store()
+    imported = sum(store.import_json(path) for path in sys.argv[1:])
+    print(f"imported {imported} of {len(sys.argv) - 1} saves, {len(store)} saves in {c.SAVES_DB}")
@@ -0,0 +1,210 @@
+import math
+import numpy as np
+import utils as u
+import config as c
+
+_MULTIPLIER_VALUES = {"TW": 3, "DW": 2, "TL": 3, "DL": 2}
+
+# premium squares of the board, indexed [row - 1, col - 1]
+LETTER_MULTIPLIERS = np.ones((c.MAX_GRID, c.MAX_GRID), dtype=np.int32)
+WORD_MULTIPLIERS = np.ones((c.MAX_GRID, c.MAX_GRID), dtype=np.int32)
+for (row, col), multiplier in c.SCORE_MULTIPLIERS.items():
+    table = WORD_MULTIPLIERS if multiplier in ("TW", "DW") else LETTER_MULTIPLIERS
+    table[row - 1, col - 1] = _MULTIPLIER_VALUES[multiplier]
+
+# points by character code; uppercase letters were played from a blank and,
+# like anything else outside a-z, score 0
+LETTER_POINTS = np.zeros(128, dtype=np.int32)
+for letter, points in c.POINTS.items():
+    LETTER_POINTS[ord(letter)] = points
+
+def get_window_squares(anchor, size):
+    """
+    Board squares under an anchor's window (see utils.get_anchor_window).
+
+    Returns (tuple[np.ndarray, np.ndarray] | None):
+        0-based (rows, cols) of the size squares of the window, None if the
+        anchor has no direction or its window runs off the board
+    """
+
+    if anchor.position is None:
+        return None
+
+    row, col, direction = anchor.position
+    steps = np.arange(size) - anchor.prefix_permitted
+    if direction == c.HORIZONTAL_ANCHOR_DIR:
+        rows, cols = np.full(size, row - 1), col - 1 + steps
+    elif direction == c.VERTICAL_ANCHOR_DIR:
+        rows, cols = row - 1 + steps, np.full(size, col - 1)
+    else:
+        raise ValueError(f"Invalid anchor direction: {direction}")
+
+    if size and (min(rows.min(), cols.min()) < 0 or max(rows.max(), cols.max()) >= c.MAX_GRID):
+        return None
+
+    return rows, cols
+
+def get_play_position(anchor, start):
+    """returns the 1-based (row, col, direction) of a play's first letter from its window start, None if the anchor has no position"""
+
+    if anchor.position is None:
+        return None
+
+    row, col, direction = anchor.position
+    step = start - anchor.prefix_permitted
+    return (row, col + step, direction) if direction == c.HORIZONTAL_ANCHOR_DIR else (row + step, col, direction)
+
+def _get_window_tables(anchor, pattern):
+    # multipliers and cross word scores of the window's squares; the premium
+    # under a placed tile was used up by the move that placed it
+    size = len(pattern)
+    placed = np.array([isinstance(square, str) for square in pattern], dtype=bool)
+    squares = get_window_squares(anchor, size)
+    if squares is None:
+        letter_multipliers = word_multipliers = np.ones(size, dtype=np.int32)
+    else:
+        letter_multipliers = np.where(placed, 1, LETTER_MULTIPLIERS[squares])
+        word_multipliers = np.where(placed, 1, WORD_MULTIPLIERS[squares])
+
+    cross_scores = np.full(size, -1, dtype=np.int32)
+    if anchor.cross_scores is not None:
+        cross_scores[:] = [-1 if score is None else score for score in anchor.cross_scores]
+    return placed, letter_multipliers, word_multipliers, cross_scores
+
+def score_plays(anchor, plays):
+    """
+    Score a batch of plays through one anchor in a few array operations.
+
+    Every play is laid out as a row of a (plays x window) matrix of letter
+    points, so premiums, word multipliers, cross words and the bingo bonus are
+    applied to the whole batch at once:
+        - letter and word premiums only count under newly placed tiles
+        - every new tile that joins a perpendicular word scores that word too,
+          with the premium of the new tile (cross_scores of the anchor)
+        - playing c.BINGO_TILES tiles earns c.BINGO_BONUS
+
+    Args:
+        anchor (utils.Anchor): anchor as produced by utils.get_anchors.
+        plays (list[tuple[str, int]]): (word, start) pairs as returned by the
+            window matchers, start being the window index of the first letter.
+
+    Returns (np.ndarray):
+        the score of each play, in order
+    """
+
+    window = u.get_anchor_window(anchor)
+    if not plays or window is None:
+        return np.zeros(len(plays), dtype=np.int32)
+
+    placed, letter_multipliers, word_multipliers, cross_scores = _get_window_tables(anchor, window[0])
+
+    words = [word for word, _ in plays]
+    lengths = np.array([len(word) for word in words])
+    starts = np.array([start for _, start in plays])
+
+    # scatter every letter of every play into its row and window column
+    codes = np.frombuffer("".join(words).encode("ascii"), dtype=np.uint8)
+    play_index = np.repeat(np.arange(len(plays)), lengths)
+    offsets = np.arange(len(codes)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    columns = np.repeat(starts, lengths) + offsets
+
+    points = np.zeros((len(plays), len(placed)), dtype=np.int32)
+    covered = np.zeros((len(plays), len(placed)), dtype=bool)
+    points[play_index, columns] = LETTER_POINTS[codes]
+    covered[play_index, columns] = True
+
+    new = covered & ~placed
+    letter_scores = points * letter_multipliers
+    main = letter_scores.sum(axis=1) * np.where(new, word_multipliers, 1).prod(axis=1)
+
+    crossed = new & (cross_scores >= 0)
+    cross = np.where(crossed, (cross_scores + letter_scores) * word_multipliers, 0).sum(axis=1)
+
+    bingo = np.where(new.sum(axis=1) == c.BINGO_TILES, c.BINGO_BONUS, 0)
+    return main + cross + bingo
+
+def choose_blank_placements(anchor, plays):
+    """
+    Puts the blanks of every play where they cost the least. The matchers
+    play a blank on the first square its letter is missing from the shelf,
+    but when the word plays that letter more than once the blank can go on
+    any of those squares (see utils.get_blank_placements): each placement is
+    scored in one score_plays batch and the best kept, ties going to the
+    matcher's own.
+
+    Args:
+        anchor (utils.Anchor): anchor the plays go through.
+        plays (list[tuple[str, int]]): (word, start) pairs as returned by the
+            window matchers.
+
+    Returns (list[tuple[str, int]]):
+        the plays in order, each with its best blank placement
+    """
+
+    window = u.get_anchor_window(anchor)
+    if window is None:
+        return plays
+
+    pattern = window[0]
+    options = [
+        u.get_blank_placements(word, {k for k in range(len(word)) if isinstance(pattern[start + k], str)}) if not word.islower() else [word]
+        for word, start in plays
+    ]
+
+    candidates = [(option, start) for (_, start), placements in zip(plays, options) if len(placements) > 1 for option in placements]
+    if not candidates:
+        return plays
+
+    scores = score_plays(anchor, candidates).tolist()
+    res, i = [], 0
+    for play, placements in zip(plays, options):
+        if len(placements) == 1:
+            res.append(play)
+            continue
+
+        # max keeps the first best, the matcher's own placement on a tie
+        best = max(range(i, i + len(placements)), key=lambda j: scores[j])
+        res.append(candidates[best])
+        i += len(placements)
+
+    return res
+
+def score_bound(anchor, shelf):
+    """
+    Upper bound on score_plays for any play through an anchor: the placed
+    letters plus the best shelf letters on the best letter premiums, times the
+    best word premiums, plus the best cross words and the bingo bonus, all
+    limited to as many new tiles as the shelf holds.
+
+    Args:
+        anchor (utils.Anchor): anchor as produced by utils.get_anchors.
+        shelf (str): the current scrabble shelf.
+
+    Returns (int | float):
+        no play of the anchor scores more; math.inf if the anchor has no
+        position to bound it with
+    """
+
+    window = u.get_anchor_window(anchor)
+    if window is None:
+        return 0
+
+    if get_window_squares(anchor, len(window[0])) is None:
+        return math.inf
+
+    placed, letter_multipliers, word_multipliers, cross_scores = _get_window_tables(anchor, window[0])
+    empty = ~placed
+    tiles = min(len(shelf), int(empty.sum()))
+
+    values = sorted((c.POINTS.get(letter, 0) for letter in shelf), reverse=True)[:tiles]
+    best_letters = sum(v * m for v, m in zip(values, sorted(letter_multipliers[empty], reverse=True)))
+    best_word_multiplier = math.prod(sorted(word_multipliers[empty].tolist(), reverse=True)[:tiles])
+    placed_points = sum(c.POINTS.get(square, 0) for square in window[0] if isinstance(square, str))
+    main = (placed_points + best_letters) * best_word_multiplier
+
+    top = values[0] if values else 0
+    cross = np.where(cross_scores >= 0, (cross_scores + top * letter_multipliers) * word_multipliers, 0)[empty]
+    best_cross = sum(sorted(cross.tolist(), reverse=True)[:tiles])
+
+    bingo = c.BINGO_BONUS if tiles >= c.BINGO_TILES else 0
+    return main + best_cross + bingo
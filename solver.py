@@ -1,75 +1,445 @@
-import uuid
+import sys
+import math
+import time
+import heapq
+import functools
+import itertools
+import threading
+import multiprocessing
+import concurrent.futures
+import numpy as np
 import utils as u
 import config as c
+import scoring as sc
+import metrics as m
+import lexicon as lx
 
+_pools = {}
+_pools_lock = threading.Lock()
+
+# anchors the ranked search keeps in flight in the pool per worker, and how
+# long it waits on one before checking its deadline and cancel again
+IN_FLIGHT_PER_WORKER = 2
+POOL_POLL_SECONDS = 0.05
+
+def match_anchor(lexicon, shelf, anchor):
+    """
+    Matches an anchor's window against the lexicon without scanning it:
+    windows with few placed letters walk the word graph, windows with many
+    intersect the positional index, where every placed letter narrows the
+    candidates further.
+
+    Returns (list[tuple[str, int]]):
+        (word, start) for every play that fits the anchor, alphabetical, with
+        start the window index of the word's first letter and any blank on
+        the square where it costs the least (see scoring.choose_blank_placements)
+    """
+
+    window = u.get_anchor_window(anchor)
+    if window is None:
+        return []
+
+    placed = sum(1 for square in window[0] if isinstance(square, str))
+    matcher = lexicon if placed >= c.POSITIONAL_INDEX_MIN_PLACED else lexicon.dawg
+    plays = list(matcher.match_window(*window, shelf))
+
+    # the matchers place blanks left to right, not where they cost least
+    if c.BLANK in shelf:
+        plays = sc.choose_blank_placements(anchor, plays)
+
+    return sorted(plays, key=lambda play: (play[0].lower(), play[0], play[1]))
+
+def format_results(plays):
+    """returns (word, score, position) plays as numbered lines for display, in order"""
+
+    res = []
+    for i, (word, score, position) in enumerate(plays):
+        res.append(f"{i+1}. {word} ({score} points) @ ({position[0]}, {position[1]}) {position[2]}")
+
+    return res
+
+def _init_worker():
+    # map the default lexicon once per worker, not once per task; any other
+    # lexicon is mapped by the worker the first time a task asks for it
+    lx.get_lexicon().dawg
+
+def _match_anchors(lexicon_name, shelf, anchors):
+    # runs in a pool worker, timing every anchor for the parent's metrics
+    lexicon = lx.get_lexicon(lexicon_name)
+    res = []
+    for anchor in anchors:
+        start = time.perf_counter()
+        plays = match_anchor(lexicon, shelf, anchor)
+        res.append((plays, time.perf_counter() - start))
+
+    return res
+
+def _get_pool(workers):
+    # pools are kept for the life of the process and shared by every Solver;
+    # workers are started with forkserver/spawn since forking a threaded
+    # Streamlit server is unsafe
+    with _pools_lock:
+        if workers not in _pools:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            _pools[workers] = concurrent.futures.ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker)
+
+        return _pools[workers]
 
 class Solver:
-    def __init__(self, shelf, anchors={}, words=None):
-        # initialize shelf and anchor game states and ensure casing is lowered 
+    def __init__(self, shelf, anchors=(), words=None, workers=c.SOLVER_WORKERS, metrics=None, lexicon=c.DEFAULT_LEXICON):
+        # initialize shelf and anchor game states, anchors are utils.Anchor
+        # records whose letters are lowercase already (see utils.Grid)
         self.shelf = shelf.lower()
-        self.anchors = [{**a, "letters": a.get("letters", "").lower()} for a in anchors]
+        self.anchors = list(anchors)
+
+        # per stage timings of this solve (see metrics.SolveMetrics), pass one
+        # in to also time the stages that run before the solver, eg. anchors
+        self.metrics = metrics if metrics is not None else m.SolveMetrics(profile=c.PROFILE_SOLVES)
 
-        self.words = u.load_words() if words is None else words
-        self.all_playable_words = self.get_all_playable_words()
-        self.anchored_playable_words = self.get_anchored_playable_words()
+        # the named lexicon (see lexicon.get_lexicon_files) is loaded once per
+        # process and shared by every Solver; an explicit word list gets its
+        # own (unshared) lexicon
+        self.lexicon_name = lexicon
+        with self.metrics.stage("lexicon load"):
+            self.lexicon = lx.get_lexicon(lexicon) if words is None else lx.Lexicon(words)
+        self.words = self.lexicon.words
+
+        # anchored search runs in a process pool of this many workers;
+        # 0 or 1 solves serially, and so does a Solver with its own word list
+        self.workers = workers if words is None else 0
+
+        # (word, start) plays matched per anchor index, filled as anchors get searched
+        self._matches = {}
+
+        # a solver can be shared by several sessions (see cache.ResultCache);
+        # the lock serializes everything that fills _matches or writes metrics
+        self._lock = threading.RLock()
+
+    @functools.cached_property
+    def all_playable_words(self):
+        return self.get_all_playable_words()
+
+    @functools.cached_property
+    def anchored_playable_words(self):
+        return self.get_anchored_playable_words()
 
     def get_all_playable_words(self):
-        return [word for word in self.words if u.is_playable(word, self.shelf)]
+        """returns every word playable from the shelf alone, highest base score first"""
+        with self._lock, self.metrics.stage("rack filter"):
+            return [word for word, _ in self.lexicon.anagrams(self.shelf)]
     
-    def get_anchored_playable_words(self):
+    def get_anchored_playable_words(self, progress=None):
+        """
+        Matches every anchor against the lexicon (see match_anchor), spread over
+        a process pool if the solver has workers and enough anchors to share.
+        progress(stage, done, total) is called as anchors get searched.
+
+        Returns (dict):
+            {anchor_position: plays} for every anchor with playable words, in
+            anchor order, where each play is (word, position) with position
+            the (row, col, direction) of the word's first letter; parallel and
+            serial solves return the same result
+        """
+
+        with self._lock:
+            if self._use_pool() and not self._matches:
+                with self.metrics.stage("search"):
+                    matches = self._match_anchors_parallel()
+                    for i, (plays, seconds) in enumerate(matches or []):
+                        self._add_matches(i, plays, seconds, progress)
+
+            matches = [self._match(i, progress) for i in range(len(self.anchors))]
+
+        # a tile can anchor several windows of its line, their plays are merged
         res = {}
-        for anchor in self.anchors:
-            letters = anchor["letters"]
-            anchor_position = anchor.get("anchor_position", uuid.uuid4())
-            relative_anchors = anchor.get('relative_anchors', [])
-            relative_letters = "".join([ra[0] for ra in relative_anchors])
+        for anchor, plays in zip(self.anchors, matches):
+            if plays:
+                res.setdefault(anchor.position, []).extend((word, sc.get_play_position(anchor, start)) for word, start in plays)
 
-            prefix_permitted = anchor.get("prefix_permitted", c.MAX_GRID)
-            prefix_required = anchor.get("prefix_required", 0)
+        return res
 
-            postfix_permitted = anchor.get("postfix_permitted", c.MAX_GRID)
-            postfix_required = anchor.get("postfix_required", 0)
+    def _match(self, i, progress=None):
+        # plays of the i-th anchor, searched at most once per solver
+        with self._lock:
+            if i not in self._matches:
+                with self.metrics.stage("search"):
+                    start = time.perf_counter()
+                    plays = match_anchor(self.lexicon, self.shelf, self.anchors[i])
+                    self._add_matches(i, plays, time.perf_counter() - start, progress)
 
-            pWords = []
-            for word in self.words:
-                # if word == anchored letters
-                if word == letters:
-                    continue
+            return self._matches[i]
 
-                # if word contains anchored letters
-                if not letters in word:
-                    continue
+    def get_size(self):
+        """rough bytes held by the anchors, the plays matched so far and the metrics, for the result cache (see cache.ResultCache)"""
+        with self._lock:
+            anchors = sum(
+                sys.getsizeof(anchor) + sum(sys.getsizeof(value) for value in anchor._values() if isinstance(value, (str, tuple)))
+                for anchor in self.anchors
+            )
+            plays = sum(
+                sys.getsizeof(plays) + sum(sys.getsizeof(play) + sys.getsizeof(play[0]) for play in plays)
+                for plays in self._matches.values()
+            )
+            metrics = sys.getsizeof(self.metrics.anchors) + sum(sys.getsizeof(record) for record in self.metrics.anchors)
 
-                # if we can play the word with current shelf
-                if not u.is_playable(word, self.shelf + letters + relative_letters):
-                    continue
+        return anchors + plays + metrics
 
-                # if word is long enough to meet prefix/postfix requirements
-                required_length = len(letters) + prefix_required + postfix_required
-                if not len(word) >= required_length:
-                    continue
+    def _add_matches(self, i, plays, seconds, progress=None):
+        self._matches[i] = plays
+        self.metrics.add_anchor(i, self.anchors[i].position, seconds, len(plays))
+        if progress is not None:
+            progress("search", len(self._matches), len(self.anchors))
 
-                # if required prefix/postfix constraints are met 
-                # and relative anchor constraints are met 
-                if not u.fits_anchor(word, letters, relative_anchors, prefix_required, prefix_permitted, postfix_required, postfix_permitted):
-                    continue
+    def _use_pool(self):
+        return self.workers > 1 and len(self.anchors) >= c.PARALLEL_MIN_ANCHORS
 
-                pWords.append(word)
+    def _submit(self, indexes, in_flight):
+        # starts searching anchors of indexes in the pool, in order, until
+        # IN_FLIGHT_PER_WORKER are in flight per worker; in_flight maps an
+        # anchor index to its future. Without a usable pool nothing is
+        # started and the anchors are searched serially by _match
+        for i in indexes:
+            if len(in_flight) >= self.workers * IN_FLIGHT_PER_WORKER:
+                break
+            if i in self._matches or i in in_flight:
+                continue
 
-            # use anchor metadata as unique fingerprint for anchor
-            if pWords:
-                res[anchor_position] = pWords
+            try:
+                in_flight[i] = _get_pool(self.workers).submit(_match_anchors, self.lexicon_name, self.shelf, [self.anchors[i]])
+            except (OSError, RuntimeError, concurrent.futures.BrokenExecutor):
+                self._drop_pool()
+                break
 
-        return res
-    
-    def get_ranked_results(self):
-        ranked_words = []
-        for anchor_position, pWords in self.anchored_playable_words.items():
-            for word in pWords:
-                ranked_words.append((word, u.score_value(word, anchor_position), anchor_position))
+    def _await_match(self, i, in_flight, deadline=None, cancel=None, progress=None):
+        # waits for the pool to search anchor i, merging every search that
+        # finishes meanwhile; stops waiting at the deadline or once cancelled
+        start = time.perf_counter()
+        while i in in_flight and not self._should_stop(deadline, cancel):
+            timeout = None if deadline is None and cancel is None else POOL_POLL_SECONDS
+            if deadline is not None:
+                timeout = max(min(timeout, deadline - time.perf_counter()), 0)
+            concurrent.futures.wait([in_flight[i]], timeout=timeout)
+            self._merge_done(in_flight, progress)
+
+        with self._lock:
+            self.metrics.add_time("search", time.perf_counter() - start)
+
+    def _merge_done(self, in_flight, progress=None):
+        for i, future in list(in_flight.items()):
+            if not future.done():
+                continue
+
+            del in_flight[i]
+            try:
+                [(plays, seconds)] = future.result()
+            except (OSError, concurrent.futures.BrokenExecutor, concurrent.futures.CancelledError):
+                # left for _match to search serially
+                self._drop_pool()
+                continue
+
+            with self._lock:
+                # another search of this solver may have got there first
+                if i not in self._matches:
+                    self._add_matches(i, plays, seconds, progress)
+
+    def _drop_pool(self):
+        # no usable pool (eg. a sandbox without process support): solve serially
+        with _pools_lock:
+            _pools.pop(self.workers, None)
+        self.workers = 0
+
+    def _match_anchors_parallel(self):
+        # contiguous chunks, a few per worker to even out uneven anchors;
+        # executor.map keeps chunk order so the merge is deterministic
+        size = math.ceil(len(self.anchors) / (self.workers * 4))
+        chunks = [self.anchors[i:i + size] for i in range(0, len(self.anchors), size)]
+
+        try:
+            pool = _get_pool(self.workers)
+            return [match for chunk in pool.map(_match_anchors, [self.lexicon_name] * len(chunks), [self.shelf] * len(chunks), chunks) for match in chunk]
+        except (OSError, concurrent.futures.BrokenExecutor):
+            self._drop_pool()
+            return None
+
+    def iter_moves(self, progress=None):
+        """
+        Yields every anchored play as (word, score, position), anchor by anchor
+        as each is searched and scored, so the first plays are available long
+        before the last anchor is searched. Unranked: plays come in anchor
+        order, alphabetical within an anchor. progress(stage, done, total) is
+        called as anchors get searched.
+        """
+
+        in_flight = {}
+        try:
+            for i, anchor in enumerate(self.anchors):
+                # with a pool, the anchors after this one are searched meanwhile
+                if self._use_pool() and i not in self._matches:
+                    self._submit(range(i, len(self.anchors)), in_flight)
+                    self._await_match(i, in_flight, progress=progress)
+
+                with self._lock:
+                    plays = self._match(i, progress)
+                    with self.metrics.stage("scoring"):
+                        # every play of an anchor is scored in one batch
+                        scores = sc.score_plays(anchor, plays).tolist()
+                        self.metrics.count("plays scored", len(plays))
+
+                for (word, start), score in zip(plays, scores):
+                    yield word, score, sc.get_play_position(anchor, start)
+        finally:
+            for future in in_flight.values():
+                future.cancel()
+
+        if progress is not None:
+            progress("ranking", 1, 1)
+
+    def iter_top_results(self, k, deadline=None, cancel=None, progress=None):
+        """
+        The k best scoring anchored plays, found with a bounded heap. Anchors are
+        visited from the highest score bound (scoring.score_bound) down, and the
+        search stops at the first anchor whose bound cannot beat the k-th best
+        play found so far, so those anchors are never searched or scored.
+
+        Yields the best k plays found so far every time an anchor changes them,
+        so a caller can show good plays while the search goes on; the last
+        list yielded is the final result (see get_top_results).
+
+        The search can also be stopped early, between two anchors: the best
+        plays found by then are yielded as the result, and the generator
+        returns True (see get_top_results). Anchors already searched are
+        kept, so asking again (eg. with a later deadline) resumes where the
+        search stopped. Searches of the same solver may run from several
+        threads at once, each with its own heap.
+
+        With workers, the next anchors in bound order that could still beat
+        the k-th best play are searched in the process pool while the
+        current one is scored; the deadline and cancel are checked while
+        waiting on them too.
+
+        Args:
+            k (int): number of plays to return.
+            deadline (float | None): time.perf_counter() time to stop searching at.
+            cancel (threading.Event | None): stops the search once set, eg.
+                from another thread.
+            progress (callable | None): progress(stage, done, total) is
+                called as anchors get searched. It is passed per search, not
+                kept, since a cached solver is searched by other sessions too.
+
+        Yields (list[tuple[str, int, tuple]]):
+            (word, score, position) of the best k plays so far, best first,
+            position being where the word's first letter goes
+        """
+
+        # min-heap of (score, -anchor index, -play index, word, position) so the
+        # root is the worst kept play, ties going to the play ranked later
+        heap = []
+        partial = False
+        with self._lock, self.metrics.stage("scoring"):
+            bounds = sorted(
+                ((sc.score_bound(anchor, self.shelf), i) for i, anchor in enumerate(self.anchors)),
+                key=lambda x: -x[0],
+            )
+
+        in_flight = {}
+        try:
+            for n, (bound, i) in enumerate(bounds):
+                if k <= 0 or (len(heap) == k and bound < heap[0][0]):
+                    break
+
+                if self._use_pool() and i not in self._matches:
+                    threshold = heap[0][0] if len(heap) == k else None
+                    self._submit((j for b, j in itertools.islice(bounds, n, None) if threshold is None or b >= threshold), in_flight)
+                    self._await_match(i, in_flight, deadline, cancel, progress)
+
+                # the lock is held for one anchor at a time, never across a yield
+                with self._lock:
+                    # anchors already searched cost no more than scoring, so only
+                    # stop ahead of one that would still need a search
+                    if i not in self._matches and self._should_stop(deadline, cancel):
+                        partial = True
+                        self.metrics.count("anchors skipped", len(bounds) - n)
+                        break
+
+                    anchor, plays = self.anchors[i], self._match(i, progress)
+                    with self.metrics.stage("scoring"):
+                        scores = sc.score_plays(anchor, plays)
+                        self.metrics.count("plays scored", len(plays))
+
+                    with self.metrics.stage("sorting"):
+                        # plays scoring below the k-th best can never enter the heap
+                        candidates = range(len(plays)) if len(heap) < k else np.flatnonzero(scores >= heap[0][0])
+                        changed = False
+                        for j in candidates:
+                            word, start = plays[j]
+                            play = (int(scores[j]), -i, -int(j), word, start)
+                            if len(heap) < k:
+                                heapq.heappush(heap, play)
+                                changed = True
+                            elif play > heap[0]:
+                                heapq.heapreplace(heap, play)
+                                changed = True
+
+                    top = self._get_heap_results(heap) if changed else None
+
+                if top is not None:
+                    yield top
+        finally:
+            # searches not started yet are dropped; asking again submits them anew
+            for future in in_flight.values():
+                future.cancel()
+
+        # anchors cut off by their bound are never searched, the solve is done
+        if progress is not None:
+            progress("ranking", 1, 1)
+        if not heap:
+            yield []
+
+        return partial
+
+    def _should_stop(self, deadline, cancel):
+        return (deadline is not None and time.perf_counter() >= deadline) or (cancel is not None and cancel.is_set())
+
+    def _get_heap_results(self, heap):
+        with self._lock, self.metrics.stage("sorting"):
+            return [
+                (word, score, sc.get_play_position(self.anchors[-i], start))
+                for score, i, _, word, start in sorted(heap, reverse=True)
+            ]
+
+    def get_top_results(self, k, deadline=None, cancel=None, progress=None):
+        """
+        Returns (tuple[list[tuple[str, int, tuple]], bool]):
+            (word, score, position) of the best k plays, best first (see
+            iter_top_results), the same plays in the same order as the top
+            of get_ranked_results; and whether the search was stopped by
+            deadline or cancel first, the plays then being the best found
+            by then
+        """
 
         res = []
-        for i, (word, score, anchor_position) in enumerate(sorted(ranked_words, key = lambda x: x[1], reverse=True)):
-            res.append(f"{i+1}. {word} ({score} points) @ ({anchor_position[0]}, {anchor_position[1]}) {anchor_position[2]}")
+        search = self.iter_top_results(k, deadline, cancel, progress)
+        while True:
+            try:
+                res = next(search)
+            except StopIteration as stop:
+                return res, stop.value
+
+    def get_ranked_results(self, limit=None):
+        """
+        Args:
+            limit (int | None): only rank the best limit plays (see get_top_results).
+
+        Returns (list[str]):
+            the anchored plays, best first, formatted for display
+        """
+
+        if limit is not None:
+            ranked_words, _ = self.get_top_results(limit)
+        else:
+            ranked_words = list(self.iter_moves())
+            with self.metrics.stage("sorting"):
+                ranked_words = sorted(ranked_words, key = lambda x: x[1], reverse=True)
 
-        return res
\ No newline at end of file
+        return format_results(ranked_words)
@@ -0,0 +1,71 @@
+import os
+import utils as u
+import config as c
+import streamlit as st
+import streamlit.components.v1 as components
+
+# Streamlit side of the board: the engine modules never import this, so
+# workers, batch jobs and benchmarks can solve without loading Streamlit
+
+# the board lives in session_state as one utils.encode_grid string; the
+# version goes up whenever Python replaces the board (load, reset) so the
+# editor knows to redraw, and so edits made before the swap are dropped
+BOARD_KEY = "board_tiles"
+BOARD_VERSION_KEY = "board_version"
+EMPTY_BOARD = c.EMPTY_SQUARE * c.MAX_GRID * c.MAX_GRID
+
+# premium of every square, row-major, "" for plain squares
+MULTIPLIER_LAYOUT = [c.SCORE_MULTIPLIERS.get((i + 1, j + 1), "") for i in range(c.MAX_GRID) for j in range(c.MAX_GRID)]
+
+_board_editor = components.declare_component(
+    "board_editor",
+    path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "board_component"),
+)
+
+def board_editor(key="board_editor", session_state=st.session_state):
+    """
+    Renders the editable board as a single component that takes and returns
+    the whole board as one compact value, instead of one widget per square.
+    Edits are written back to session_state, see get_grid.
+    """
+
+    board = session_state.setdefault(BOARD_KEY, EMPTY_BOARD)
+    version = session_state.setdefault(BOARD_VERSION_KEY, 0)
+
+    value = _board_editor(
+        board=board,
+        version=version,
+        size=c.MAX_GRID,
+        tile=c.PIXEL_COUNT_PER_TILE,
+        multipliers=MULTIPLIER_LAYOUT,
+        colors={k or "": v for k, v in c.MULTIPLIER_COLORS.items()},
+        key=key,
+        default=None,
+    )
+
+    # edits made against an older version of the board were overwritten by a load or reset
+    if value is not None and value.get("version") == version:
+        session_state[BOARD_KEY] = value["board"]
+
+def get_grid(session_state=st.session_state):
+    """
+        Extracts the current Scrabble board state from Streamlit session_state.
+        Args:
+            session_state (st.session_state): The Streamlit session state object.
+    """
+
+    return u.decode_grid(session_state.get(BOARD_KEY, EMPTY_BOARD))
+
+def set_grid(grid=None, session_state=st.session_state, reset=False):
+    """
+    Sets or resets the Scrabble board state in Streamlit session_state.
+
+    Args:
+        grid (list[list[str]] or None): 2D list representing the Scrabble board.
+                                        If None and reset=True, initializes with empty strings.
+        session_state (st.session_state): The Streamlit session state object.
+        reset (bool): If True, resets the board to empty strings.
+    """
+
+    session_state[BOARD_KEY] = EMPTY_BOARD if reset or grid is None else u.encode_grid(grid)
+    session_state[BOARD_VERSION_KEY] = session_state.get(BOARD_VERSION_KEY, 0) + 1
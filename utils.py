@@ -1,11 +1,126 @@
+import itertools
 import config as c
-import streamlit as st
 
-def load_words():
-    with open (c.WORDS_FILE, "r") as f:
-        words = [line.strip() for line in f.readlines()]
+def load_words(path=c.WORDS_FILE):
+    """
+    returns the words of a word list file, one per line, lowercased and
+    without duplicates; lines that are not a single a-z word once lowercased
+    (blank lines, comments, accented or non-ASCII words) are skipped, so
+    downloaded lists in any case can be used as they are
+    """
+
+    with open (path, "r", encoding="utf-8", errors="replace") as f:
+        words = [line.strip().lower() for line in f.readlines()]
+
+    return list(dict.fromkeys(word for word in words if word.isascii() and word.isalpha()))
+
+def letter_counts(word):
+    """
+    returns a 26 byte record of letter counts for word, ordered a-z
+    non a-z characters are ignored
+    """
+
+    counts = bytearray(len(c.ALPHABET))
+    for letter in word:
+        i = c.LETTER_INDEX.get(letter)
+        if i is not None:
+            counts[i] += 1
+
+    return bytes(counts)
+
+def encode_grid(grid):
+    """returns the board as one row-major string of c.MAX_GRID**2 characters, c.EMPTY_SQUARE for empty squares"""
+    return "".join(cell.strip()[:1] or c.EMPTY_SQUARE for row in grid for cell in row)
+
+def decode_grid(board):
+    """inverse of encode_grid, returns the board in the format of ui.get_grid"""
+    return [
+        ["" if square == c.EMPTY_SQUARE else square for square in board[i:i + c.MAX_GRID]]
+        for i in range(0, c.MAX_GRID * c.MAX_GRID, c.MAX_GRID)
+    ]
+
+class Grid:
+    """
+    Compact, immutable board for the engine: the squares as one row-major
+    string in the format of encode_grid (lowercase, c.EMPTY_SQUARE for empty
+    squares), its column-major transpose, and an occupancy bitboard per row
+    and per column where bit k is set if the k-th square of the line holds
+    a tile.
+
+    Every row and column is a plain slice of one of the two strings, and a
+    Grid hashes, compares and pickles as its squares string, so boards are
+    cheap to hash, copy and send to worker processes.
+
+    Args:
+        board (str): the squares, as returned by encode_grid.
+    """
+
+    __slots__ = ("squares", "transposed", "row_bits", "col_bits")
+
+    def __init__(self, board=c.EMPTY_SQUARE * c.MAX_GRID * c.MAX_GRID):
+        n = c.MAX_GRID
+        if len(board) != n * n:
+            raise ValueError(f"expected {n * n} squares, got {len(board)}")
+
+        self.squares = board.lower()
+        self.transposed = "".join(self.squares[j::n] for j in range(n))
+        self.row_bits = tuple(_get_line_bits(self.row(i)) for i in range(n))
+        self.col_bits = tuple(_get_line_bits(self.col(j)) for j in range(n))
+
+    @classmethod
+    def from_grid(cls, grid):
+        """returns grid, a Grid or a board in the format of ui.get_grid, as a Grid"""
+        return grid if isinstance(grid, cls) else cls(encode_grid(grid))
+
+    def row(self, i):
+        """returns the i-th row (0-based) as a string of squares"""
+        return self.squares[i * c.MAX_GRID:(i + 1) * c.MAX_GRID]
+
+    def col(self, j):
+        """returns the j-th column (0-based) as a string of squares"""
+        return self.transposed[j * c.MAX_GRID:(j + 1) * c.MAX_GRID]
+
+    def diff(self, other):
+        """returns the 0-based (row, col) squares that differ between this board and other"""
+
+        changed = set()
+        for i in range(c.MAX_GRID):
+            row, other_row = self.row(i), other.row(i)
+            if row != other_row:
+                changed.update((i, j) for j in range(c.MAX_GRID) if row[j] != other_row[j])
+
+        return changed
+
+    @property
+    def is_empty(self):
+        """True if no square holds a tile"""
+        return not any(self.row_bits)
+
+    def to_grid(self):
+        """returns the board in the format of ui.get_grid"""
+        return decode_grid(self.squares)
 
-    return words
+    def __eq__(self, other):
+        return isinstance(other, Grid) and self.squares == other.squares
+
+    def __hash__(self):
+        return hash(self.squares)
+
+    def __reduce__(self):
+        # the transpose and bitboards are rebuilt from the squares on unpickling
+        return (Grid, (self.squares,))
+
+    def __repr__(self):
+        return f"Grid({self.squares!r})"
+
+def _get_line_bits(line):
+    # occupancy bitboard of a row or column, bit k set if square k holds a tile
+    bits = 0
+    for k, square in enumerate(line):
+        if square != c.EMPTY_SQUARE:
+            bits |= 1 << k
+
+    return bits
 
 def is_playable(word, letters):
     """
@@ -16,6 +131,7 @@ def is_playable(word, letters):
             letters (str | dict):
                 if letters is a str, its interpreted as the current scrabble shelf
                     and a dict of schema {letter: cnt of letter on shelf} is created  
+                blanks (c.BLANK) on the shelf stand in for any letter the shelf is short of
 
         Returns (bool):
             True if word is playable with given letters else False
@@ -27,21 +143,66 @@ def is_playable(word, letters):
     if isinstance(letters, str):
         letters = {k: letters.count(k) for k in letters}
 
+    # every letter the shelf is short of has to come from a blank
+    shortage = 0
     word_breakdown = {w: word.count(w) for w in word}
     for w, cnt in word_breakdown.items():
-        if w not in letters or cnt > letters[w]:
-            # checks if letter in word exists on shelf
-            # and if the word needs more of a given letter than we have on shelf
-            return False 
-        
-    return True
+        # checks if letter in word exists on shelf
+        # and if the word needs more of a given letter than we have on shelf
+        shortage += max(cnt - letters.get(w, 0), 0)
+
+    return shortage <= letters.get(c.BLANK, 0)
+
+def assign_blanks(word, letters):
+    """
+    returns word with every letter that letters is short of in uppercase,
+    marking the tiles that have to be played from blanks
+    letters are taken from the shelf left to right before any blank is used
+    """
+
+    available = {k: letters.count(k) for k in letters}
+    res = ""
+    for letter in word:
+        if available.get(letter, 0):
+            available[letter] -= 1
+            res += letter
+        else:
+            res += letter.upper()
+
+    return res
+
+def get_blank_placements(word, fixed=()):
+    """
+    returns every way of playing word with its blanks (uppercase letters)
+    moved to other squares of the same letter, word itself first; a blank
+    scores 0 wherever it goes, but the premium under it does not. Indexes in
+    fixed hold tiles already on the board and never take a blank
+    """
+
+    res = [word]
+    for letter in sorted({ch.lower() for ch in word if ch.isupper()}):
+        squares = [k for k, ch in enumerate(word) if ch.lower() == letter and k not in fixed]
+        blanks = sum(word[k].isupper() for k in squares)
+        if blanks == len(squares):
+            continue
+
+        placements = []
+        for option in res:
+            for chosen in itertools.combinations(squares, blanks):
+                chars = list(option)
+                for k in squares:
+                    chars[k] = letter.upper() if k in chosen else letter
+                placements.append("".join(chars))
+        res = placements
+
+    return list(dict.fromkeys([word] + res))
 
 def score_value(word, anchor_position=None):
     """
     Calculate the Scrabble score for a word.
 
     If no anchor position is given, the function simply sums the base
-    letter values. If an anchor position is provided, the function
+    letter values. Uppercase letters were played from a blank and score 0. If an anchor position is provided, the function
     applies board multipliers (Double/Triple Letter, Double/Triple Word)
     according to the standard Scrabble board layout.
 
@@ -58,7 +219,7 @@ def score_value(word, anchor_position=None):
     """
 
     if anchor_position is None:
-        return sum([c.POINTS[letter] for letter in word])
+        return sum([c.POINTS.get(letter, 0) for letter in word])
     
     row, col, direction = anchor_position
 
@@ -74,7 +235,7 @@ def score_value(word, anchor_position=None):
     total_points = 0
 
     for letter, tile in zip(word, tiles):
-        base_points = c.POINTS[letter]
+        base_points = c.POINTS.get(letter, 0)
         multiplier = c.SCORE_MULTIPLIERS.get(tile)
 
         if multiplier == "TW":
@@ -163,7 +324,181 @@ def fits_anchor(word, sub, rel_anchors, pre_req, pre_perm, post_req, post_perm):
 
     return False
 
-def generate_anchors_from_slice(arr, arr_attrs):
+class Anchor:
+    """
+    Fixed-layout record of an anchor, as produced by get_anchors: a run of
+    placed letters that words are built through, and the room around it.
+
+    Attributes:
+        letters (str): the placed letters the anchor starts at, lowercase.
+        position (tuple[int, int, str] | None): (row, col, direction) of
+            the first of those letters, 1-based.
+        prefix_permitted, postfix_permitted (int): squares available before
+            and after letters.
+        prefix_required, postfix_required (int): squares that must be used
+            before and after letters.
+        relative_anchors (tuple[tuple[str, int], ...]): further placed
+            letters within reach, as (letters, offset from the anchor).
+        cross_checks, cross_scores (tuple | None): the (mask, score) cross
+            checks of the squares of the anchor's window, from its first
+            permitted prefix square (see get_cross_checks), None if the
+            anchor was made without a word graph.
+    """
+
+    __slots__ = ("letters", "position", "prefix_permitted", "postfix_permitted", "prefix_required", "postfix_required", "relative_anchors", "cross_checks", "cross_scores")
+
+    def __init__(self, letters, position=None, prefix_permitted=c.MAX_GRID, postfix_permitted=c.MAX_GRID, prefix_required=0, postfix_required=0, relative_anchors=(), cross_checks=None, cross_scores=None):
+        self.letters = letters
+        self.position = position
+        self.prefix_permitted = prefix_permitted
+        self.postfix_permitted = postfix_permitted
+        self.prefix_required = prefix_required
+        self.postfix_required = postfix_required
+        self.relative_anchors = relative_anchors
+        self.cross_checks = cross_checks
+        self.cross_scores = cross_scores
+
+    def _values(self):
+        return tuple(getattr(self, name) for name in Anchor.__slots__)
+
+    def __eq__(self, other):
+        return isinstance(other, Anchor) and self._values() == other._values()
+
+    def __hash__(self):
+        return hash(self._values())
+
+    def __reduce__(self):
+        # positional, so a pickled anchor carries no attribute names
+        return (Anchor, self._values())
+
+    def __repr__(self):
+        return f"Anchor({', '.join(f'{name}={value!r}' for name, value in zip(Anchor.__slots__, self._values()))})"
+
+def get_anchor_window(anchor):
+    """
+    Lay an anchor out as a window of squares for the window matchers
+    (see dawg.Dawg.match_window). This is the positional form of the
+    constraints fits_anchor checks word by word.
+
+    Args:
+        anchor (Anchor): anchor as produced by get_anchors.
+
+    Returns (tuple | None):
+        (pattern, first_start, last_start, first_end, last_end) where pattern
+        holds, for each square of the window, the placed letter (str) or the
+        mask of letters allowed on the empty square (int, see get_cross_checks).
+        None if the anchor's placed letters contradict each other or fall
+        outside the window, in which case no word can fit it.
+    """
+
+    letters = anchor.letters
+    prefix_permitted = anchor.prefix_permitted
+    postfix_permitted = anchor.postfix_permitted
+
+    size = prefix_permitted + len(letters) + postfix_permitted
+    pattern = [c.ALL_LETTERS] * size if anchor.cross_checks is None else list(anchor.cross_checks)
+
+    for sub, offset in ((letters, 0), *anchor.relative_anchors):
+        for k, letter in enumerate(sub.lower()):
+            i = prefix_permitted + offset + k
+            if not 0 <= i < size or (isinstance(pattern[i], str) and pattern[i] != letter):
+                return None
+
+            pattern[i] = letter
+
+    last_letter = prefix_permitted + len(letters) - 1
+    return (
+        pattern,
+        0,
+        prefix_permitted - anchor.prefix_required,
+        last_letter + anchor.postfix_required,
+        last_letter + postfix_permitted,
+    )
+
+def get_cross_checks(grid, dawg):
+    """
+    Work out, for every empty square, which letters can be placed on it without
+    forming an invalid word perpendicular to the direction of play.
+
+    Args:
+        grid (Grid | list[list[str]]): the board, as returned by ui.get_grid.
+        dawg (dawg.Dawg): word graph of the lexicon to validate against.
+
+    Returns (dict):
+        {direction: (masks, scores)} for c.HORIZONTAL_ANCHOR_DIR and
+        c.VERTICAL_ANCHOR_DIR, where for the square at grid[i][j]:
+            - masks[i][j] (int): bit k is set if c.ALPHABET[k] may be played
+              there, c.ALL_LETTERS if no perpendicular word is formed.
+            - scores[i][j] (int | None): base points of the perpendicular tiles
+              a letter played there joins, None if it joins none.
+    """
+
+    grid = Grid.from_grid(grid)
+    row_checks, col_checks = _get_board_cross_checks(grid, dawg)
+
+    res = {}
+    for direction, checks in ((c.HORIZONTAL_ANCHOR_DIR, row_checks), (c.VERTICAL_ANCHOR_DIR, [list(row) for row in zip(*col_checks)])):
+        masks = [[mask for mask, _ in row] for row in checks]
+        scores = [[score for _, score in row] for row in checks]
+        res[direction] = (masks, scores)
+
+    return res
+
+def _get_board_cross_checks(grid, dawg):
+    # (mask, score) cross checks of every row, for words played along it, and
+    # of every column; words played along a row are crossed by columns and
+    # vice versa, so each is the transpose of the other direction's line checks
+    n = c.MAX_GRID
+    row_lines = [get_line_cross_checks(grid.row(i), dawg) for i in range(n)]
+    col_lines = [get_line_cross_checks(grid.col(j), dawg) for j in range(n)]
+    return [[col_lines[j][i] for j in range(n)] for i in range(n)], [[row_lines[i][j] for i in range(n)] for j in range(n)]
+
+def get_line_cross_checks(line, dawg):
+    """
+    Cross checks for words played across a single row or column.
+
+    Args:
+        line (str): the row or column as a string of squares, see Grid.row.
+        dawg (dawg.Dawg): word graph of the lexicon to validate against.
+
+    Returns (list[tuple[int, int | None]]):
+        one (mask, score) pair per square of line, as described in get_cross_checks
+    """
+
+    checks = []
+    for k, letter in enumerate(line):
+        if letter != c.EMPTY_SQUARE:
+            checks.append((c.ALL_LETTERS, None))
+            continue
+
+        before = _get_prefix(line, k)
+        after = _get_postfix(line, k)
+        if not (before or after):
+            checks.append((c.ALL_LETTERS, None))
+            continue
+
+        mask = 0
+        node = dawg.walk(before)
+        if node or not before:
+            for li in range(len(c.ALPHABET)):
+                child = dawg.table[26*node + li]
+                if child and dawg.terminal[dawg.walk(after, child)]:
+                    mask |= 1 << li
+
+        checks.append((mask, sum(c.POINTS.get(l, 0) for l in before + after)))
+
+    return checks
+
+def _get_prefix(line, i):
+    # tiles directly preceding square i
+    return line[line.rfind(c.EMPTY_SQUARE, 0, i) + 1:i]
+
+def _get_postfix(line, i):
+    # tiles directly following square i
+    end = line.find(c.EMPTY_SQUARE, i + 1)
+    return line[i + 1:end if end != -1 else len(line)]
+
+def generate_anchors_from_slice(line, arr_attrs, cross_checks=None, bits=None):
     """
     Generate anchor definitions from a 1D slice of the Scrabble board
     (either a row or a column). Anchors represent placed tiles that can
@@ -171,29 +506,30 @@ def generate_anchors_from_slice(arr, arr_attrs):
     space available before and after them.
 
     Args:
-        arr (list[str]): A 1D view of the board row/column. Each element
-            should be either a single character string (letter tile) or an
-            empty string/whitespace if the square is unoccupied.
+        line (str): the row or column as a string of squares, see Grid.row.
         arr_attrs (tuple[str, int]): Metadata describing the slice.
             - arr_type (str): "row" or "col", indicating whether this is a
               horizontal or vertical slice.
             - arr_index (int): The index of the row or column in the full
               2D board (0-based).
+        cross_checks (list[tuple[int, int | None]] | None): Optional
+            (mask, score) cross check per square of the slice, see
+            get_cross_checks.
+        bits (int | None): occupancy bitboard of line (see Grid.row_bits),
+            worked out from line if None.
 
     Returns:
-        list[dict]: A list of anchor definitions. Each anchor dict includes:
-            - "anchor_position" (tuple[int, int]): The (row, col) position
-              of the anchor on the full board (1-based indices).
-            - "letters" (str): The base letter at the anchor position.
-            - "prefix_permitted" (int): Number of tiles available before
-              the anchor in this row/column.
-            - "postfix_permitted" (int): Number of tiles available after
-              the anchor in this row/column.
-            - "relative_anchors" (list[tuple[str, int]]): Additional
-              anchors relative to the base anchor when gaps exist. Each
-              tuple contains:
-                * The relative anchor letter (str).
-                * The relative offset from the base anchor (int).
+        list[Anchor]: one record per anchor (see Anchor), with:
+            - position: the (row, col, direction) of the anchor's tile on
+              the full board (1-based indices).
+            - letters: the letter of the anchor's tile.
+            - prefix_permitted, postfix_permitted: number of tiles
+              available before and after the anchor in this row/column.
+            - relative_anchors: further tiles within reach when gaps
+              exist, as (letter, offset from the anchor) pairs.
+            - cross_checks, cross_scores: only if cross_checks is given,
+              the masks and scores for the squares of the anchor's window,
+              from its first permitted prefix square.
 
     Notes:
         - Prefix and postfix values represent the maximum playable space
@@ -206,115 +542,70 @@ def generate_anchors_from_slice(arr, arr_attrs):
           end of the row/column.
     """
 
-    def _get_prefix(arr, i):
-      # identify characters directly preceding anchor
-      # appended to rel_anchors downstream
-      prefix = ""
-      while i > 0 and arr[i-1].strip():
-          prefix += arr[i-1]
-          i -= 1
-
-      return prefix[::-1]
-
     arr_type, arr_index = arr_attrs
-    lng = len(arr)
+    if bits is None:
+        bits = _get_line_bits(line)
 
-    # get all indices of arr with played tiles
-    positions = []
-    for i in range(lng):
-        letter = arr[i].strip()
-        
-        if letter:
-            positions.append((letter, i))
+    def _make_anchor(k, prefix_permitted, postfix_permitted, relative_anchors):
+        position = (arr_index + 1, k + 1, c.HORIZONTAL_ANCHOR_DIR) if arr_type == "row" else (k + 1, arr_index + 1, c.VERTICAL_ANCHOR_DIR)
 
-    anchors = []
-    for p1 in range(len(positions)):
-
-        p2 = 0
-        prefix_permitted = (positions[p1][1] - 0) if p1 == 0 else max(positions[p1][1] - positions[p1-1][1] - 2, 0)
-        prefix = _get_prefix(arr, positions[p1][1])
-        while p2 < len(positions):
-            playable_space = max(positions[p2][1] - positions[p1][1] - 2, 0)
-            
-            rel_anchors = []
-            num_rel_anchors = max(p2 - p1, 0)
-            for i in range(1, num_rel_anchors + 1):
-                rel_anchors.append((positions[p1 + i][0], positions[p1 + i][1] - positions[p1][1]))
-
-            if playable_space and ((positions[p1][1] + playable_space) not in [pos[1] for pos in positions]) :
-                if prefix:
-                  rel_anchors.append((prefix, -len(prefix)))
-
-                anchors.append({
-                    "anchor_position": (arr_index + 1, positions[p1][1] + 1) if arr_type == "row" else (positions[p1][1] + 1, arr_index + 1),
-                    "letters": positions[p1][0],
-                    "prefix_permitted": prefix_permitted,
-                    "postfix_permitted": playable_space,
-                    "relative_anchors": rel_anchors
-                })
-
-            p2 += 1
-
-    # check for a gap between last played tile and end of arr
-    if positions and positions[-1][1] < len(arr) - 1:
-        prefix_permitted = (positions[-1][1] - 0) if len(positions) == 1 else max(positions[-1][1] - positions[-2][1] - 2, 0)
-        
-        prefix = _get_prefix(arr, positions[-1][1])
-        rel_anchors = [(prefix, -len(prefix))] if prefix else []
-
-        playable_space = len(arr) - positions[-1][1] - 1
-        anchors.append({
-            "anchor_position": (arr_index + 1, positions[-1][1] + 1, c.HORIZONTAL_ANCHOR_DIR) if arr_type == "row" else (positions[-1][1] + 1, arr_index + 1, c.VERTICAL_ANCHOR_DIR),
-            "letters": positions[-1][0],
-            "prefix_permitted": prefix_permitted,
-            "postfix_permitted": playable_space,
-            "relative_anchors": rel_anchors
-        })
-    
-    return anchors
+        # slice the line's cross checks down to the anchor's window
+        masks = scores = None
+        if cross_checks is not None:
+            window = cross_checks[k - prefix_permitted:k + 1 + postfix_permitted]
+            masks = tuple(mask for mask, _ in window)
+            scores = tuple(score for _, score in window)
 
-def get_anchors(grid):
-    
-    anchors = []
+        return Anchor(line[k], position, prefix_permitted, postfix_permitted, relative_anchors=relative_anchors, cross_checks=masks, cross_scores=scores)
 
-    for i, row in enumerate(grid):
-        anchors += generate_anchors_from_slice(row, ("row", i))
+    # indices of the squares of the line with played tiles
+    positions = [k for k in range(len(line)) if bits >> k & 1]
 
-    cols = [list(col) for col in zip(*grid)]
-    for i, col in enumerate(cols):
-        anchors += generate_anchors_from_slice(col, ("col", i))
+    anchors = []
+    for p1, k in enumerate(positions):
+        prefix_permitted = k if p1 == 0 else max(k - positions[p1 - 1] - 2, 0)
+        prefix = _get_prefix(line, k)
+        prefix_anchor = ((prefix, -len(prefix)),) if prefix else ()
+
+        for p2 in range(p1 + 1, len(positions)):
+            playable_space = max(positions[p2] - k - 2, 0)
+            if playable_space and not bits >> (k + playable_space) & 1:
+                rel_anchors = tuple((line[m], m - k) for m in positions[p1 + 1:p2 + 1])
+                anchors.append(_make_anchor(k, prefix_permitted, playable_space, rel_anchors + prefix_anchor))
+
+    # check for a gap between last played tile and end of line
+    if positions and positions[-1] < len(line) - 1:
+        k = positions[-1]
+        prefix_permitted = k if len(positions) == 1 else max(k - positions[-2] - 2, 0)
+        prefix = _get_prefix(line, k)
+        anchors.append(_make_anchor(k, prefix_permitted, len(line) - k - 1, ((prefix, -len(prefix)),) if prefix else ()))
 
     return anchors
 
-def get_grid(session_state=st.session_state):
-    """
-        Extracts the current Scrabble board state from Streamlit session_state.
-        Args:
-            session_state (st.session_state): The Streamlit session state object.
+def get_anchors(grid, dawg=None):
     """
-    
-    grid = []
-    for i in range(c.MAX_GRID):
-        grid.append([])
-        for j in range(c.MAX_GRID):
-            grid[i].append(session_state.get(str(c.tile_key(i, j)), ""))
+    Collects the anchors of every row and column of the board. If a word graph
+    is given, each anchor also carries the cross checks of its window so the
+    solver only tries letters that keep perpendicular words valid.
 
-    return grid
+    Args:
+        grid (Grid | list[list[str]]): the board, as returned by ui.get_grid.
+        dawg (dawg.Dawg | None): word graph of the lexicon.
 
-def set_grid(grid=None, session_state=st.session_state, reset=False):
+    Returns (list[Anchor]):
+        the anchors of every row, then of every column
     """
-    Sets or resets the Scrabble board state in Streamlit session_state.
 
-    Args:
-        grid (list[list[str]] or None): 2D list representing the Scrabble board.
-                                        If None and reset=True, initializes with empty strings.
-        session_state (st.session_state): The Streamlit session state object.
-        reset (bool): If True, resets the board to empty strings.
-    """
+    grid = Grid.from_grid(grid)
+    row_checks = col_checks = [None] * c.MAX_GRID
+    if dawg is not None:
+        row_checks, col_checks = _get_board_cross_checks(grid, dawg)
+
+    anchors = []
     for i in range(c.MAX_GRID):
-        for j in range(c.MAX_GRID):
-            key = str(c.tile_key(i, j))
-            if reset or grid is None:
-                session_state[key] = ""
-            else:
-                session_state[key] = grid[i][j]
\ No newline at end of file
+        anchors += generate_anchors_from_slice(grid.row(i), ("row", i), row_checks[i], grid.row_bits[i])
+
+    for j in range(c.MAX_GRID):
+        anchors += generate_anchors_from_slice(grid.col(j), ("col", j), col_checks[j], grid.col_bits[j])
+
+    return anchors